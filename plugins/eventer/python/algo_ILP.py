@@ -1,18 +1,50 @@
-import pulp
+import io
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
 from datetime import timedelta
+import numpy as np
 from models import User, Issue
-from filter_eval import evaluate_filter_block  # Import filter evaluation
+from eligibility import EligibilityIndex, get_rating
+from sparse_model import SparseModel
+from solvers import get_backend
 import algo_greedy
 import diagnostics
+from helper import overlap_cliques
 
-def ilp(issues, users, allow_partial=False, filter_penalty=100):
+# Below this many candidate variables the components are solved in-process;
+# a process pool only pays off once there is real model-building work to spread.
+PARALLEL_MIN_VARIABLES = 2000
+
+# Seed of the per-column tie-break bonus, fixed so every run and backend agrees.
+TIE_BREAK_SEED = 0
+
+def ilp(issues, users, allow_partial=False, filter_penalty=100, index=None, warm_start=False, stats=None,
+        max_workers=None, time_limit=None, gap_rel=None, solver="cbc"):
     """
     ILP-based assignment of users to issues with custom filtering as a soft constraint.
+    The problem is split into independent components (see decompose) and every
+    component is solved as its own ILP, in parallel when the problem is large.
+    With allow_partial the required counts become upper bounds with a coverage
+    reward, so one solve returns the best partial schedule when not every seat
+    can be filled.
     Args:
         issues: List of Issue objects.
         users: List of User objects.
-        allow_partial: If True, falls back to greedy if ILP is infeasible.
+        allow_partial: If True, fill as many seats as possible (soft coverage); falls back
+            to greedy only if even that model has no solution (e.g. conflicting forward assignments).
         filter_penalty: Penalty for assigning a user who fails custom filters.
+        index: EligibilityIndex for issues/users, built here if not given.
+        warm_start: If True, the greedy assignment is passed to the solver as the initial incumbent.
+        stats: Optional dict filled with timing information about the run.
+        max_workers: Worker processes for the components. None picks the CPU count
+            and only uses a pool for large problems, 1 always solves in-process.
+        time_limit: Wall-clock limit in seconds for the whole run. When it is hit,
+            the best feasible solution found so far is returned; components
+            still queued at that point get the greedy assignment.
+        gap_rel: Relative MIP gap at which the solver may stop (e.g. 0.01 for 1%).
+        solver: ILP backend, 'cbc' or 'highs' (see solvers.SOLVER_BACKENDS).
     Returns:
         Dictionary: { issue_id: { role_name: [list_of_assigned_user_ids] } }
     """
@@ -21,173 +53,408 @@ def ilp(issues, users, allow_partial=False, filter_penalty=100):
         if issue.end_datetime is None:
             issue.end_datetime = issue.start_datetime + timedelta(hours=3)
 
-    # Build a list of issue-role combinations with details.
-    issue_roles = []
-    for issue in issues:
-        for req_role in issue.required_roles:
-            issue_roles.append({
-                "issue_id": issue.id,
-                "subject": issue.subject,
-                "role": req_role.role,
-                "required_count": req_role.required_count,
-                "start": issue.start_datetime,
-                "end": issue.end_datetime,
-                "category": issue.category,
-                "forward_assigned_users": [u.id for u in req_role.assigned_users]  # Track forward assignments
-            })
-
-    # Build lookup for issue time windows (for overlap constraints)
-    issue_time = {issue.id: (issue.start_datetime, issue.end_datetime) for issue in issues}
-
-    # Create the ILP model.
-    model = pulp.LpProblem("Issue_Assignment", pulp.LpMaximize)
-    x = {}  # Decision variables: keys (issue_id, user_id, role) -> binary variable
-    filter_violations = {}  # Track filter violations: keys (issue_id, user_id, role) -> 0 or 1
+    if index is None:
+        index = EligibilityIndex(issues, users)
+    get_backend(solver)  # Fail on an unknown solver before any work is done
 
-    # Helper function: returns user's rating for (role, category) or 0 if unqualified.
-    def get_rating(user, role, category):
-        for q in user.qualifications:
-            if q.role == role and (category is None or q.category == category):
-                return q.rating
-        return 0
+    # Components share one deadline, so queued ones get what is left of the limit.
+    deadline = time.time() + time_limit if time_limit is not None else None
 
-    # Create decision variables for qualified and available users, track filter violations.
-    for ir in issue_roles:
-        i_id = ir["issue_id"]
-        role = ir["role"]
-        cat = ir["category"]
-        forward_assigned = ir["forward_assigned_users"]
-        
-        # First, create variables for forward assigned users without any checks
-        for user_id in forward_assigned:
-            var_name = f"x_{i_id}_{user_id}_{role}"
-            x[(i_id, user_id, role)] = pulp.LpVariable(var_name, cat=pulp.LpBinary)
-            filter_violations[(i_id, user_id, role)] = 0  # No filter violations for forward assignments
-        
-        # Then create variables for other users with all checks
-        for user in users:
-            if user.id in forward_assigned:
-                continue
-                
-            rating = get_rating(user, role, cat)
-            if rating <= 0:
-                continue
-
-            if not user.is_available(ir["start"], ir["end"]):
-                continue
-
-            # 🚀 **Evaluate custom filters, but allow variable creation**
-            issue_context = {
-                "category": ir["category"],
-                "start_time": ir["start"],
-                "end_time": ir["end"],
-                "assigned_users": []
-            }
-
-            # Check if user fails any filter
-            fails_filter = any(not evaluate_filter_block(cf.conditions, issue_context)
-                              for cf in user.custom_filters)
-            filter_violations[(i_id, user.id, role)] = 1 if fails_filter else 0
-
-            var_name = f"x_{i_id}_{user.id}_{role}"
-            x[(i_id, user.id, role)] = pulp.LpVariable(var_name, cat=pulp.LpBinary)
+    components = decompose(issues, index)
+    jobs = []
+    for component in components:
+        sub_index = index.subset(component)
+        jobs.append((component, sub_index.users, sub_index, filter_penalty, warm_start, deadline, gap_rel, solver,
+                     allow_partial))
 
-    # Objective: maximize total rating, penalize filter violations.
-    model += pulp.lpSum(
-        (get_rating(u, ir["role"], ir["category"]) -
-         filter_penalty * filter_violations.get((ir["issue_id"], u.id, ir["role"]), 0)) *
-        x[(ir["issue_id"], u.id, ir["role"])]
-        for ir in issue_roles
-        for u in users if (ir["issue_id"], u.id, ir["role"]) in x
-    ), "Total_Rating_With_Penalties"
-
-    # Constraint 1: For each issue-role, assign exactly the required number of users.
-    for ir in issue_roles:
-        i_id = ir["issue_id"]
-        role = ir["role"]
-        req_count = ir["required_count"]
-        forward_assigned = ir["forward_assigned_users"]
-        
-        # If there are forward assignments, ensure they are maintained
-        if forward_assigned:
-            for user_id in forward_assigned:
-                if (i_id, user_id, role) in x:
-                    model += x[(i_id, user_id, role)] == 1, f"ForwardAssign_{i_id}_{user_id}_{role}"
-        
-        vars_for_ir = [x[(i_id, u.id, role)] for u in users if (i_id, u.id, role) in x]
-        if not vars_for_ir:
-            print(f"⚠️ No available users for issue {i_id}, role '{role}' — Debug")
-        model += pulp.lpSum(vars_for_ir) == req_count, f"ReqCount_{i_id}_{role}"
+    variable_count = sum(len(index.candidates(issue.id, req.role)) for issue in issues for req in issue.required_roles)
+    if max_workers is None:
+        use_pool = len(jobs) > 1 and variable_count >= PARALLEL_MIN_VARIABLES
+    else:
+        use_pool = len(jobs) > 1 and max_workers > 1
 
-    # Constraint 2: Prevent same user assigned to multiple roles within one issue
-    for issue in issues:
-        for user in users:
-            vars_same_issue = [
-                x[(issue.id, user.id, role.role)]
-                for role in issue.required_roles
-                if (issue.id, user.id, role.role) in x
-            ]
-            if vars_same_issue:
-                model += pulp.lpSum(vars_same_issue) <= 1, f"NoMultiRole_{issue.id}_{user.id}"
-
-    # Helper: Check if two time periods overlap.
-    def times_overlap(s1, e1, s2, e2):
-        e1 = e1 if e1 is not None else s1 + timedelta(hours=3)
-        e2 = e2 if e2 is not None else s2 + timedelta(hours=3)
-        return (s1 < e2) and (s2 < e1)
+    if use_pool:
+        print(f"🧩 Solving {len(jobs)} independent components in parallel...")
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            results = list(pool.map(_solve_component_job, jobs))
+    else:
+        results = [_solve_component_job(job) for job in jobs]
 
-    # Constraint 3: A user cannot be double-booked for overlapping issues.
-    for u in users:
-        for i1 in issues:
-            for i2 in issues:
-                if i1.id >= i2.id:
-                    continue
-                (s1, e1) = issue_time[i1.id]
-                (s2, e2) = issue_time[i2.id]
-                if times_overlap(s1, e1, s2, e2):
-                    vars_i1 = [x[(i1.id, u.id, req.role)]
-                               for req in i1.required_roles if (i1.id, u.id, req.role) in x]
-                    vars_i2 = [x[(i2.id, u.id, req.role)]
-                               for req in i2.required_roles if (i2.id, u.id, req.role) in x]
-                    if vars_i1 or vars_i2:
-                        model += pulp.lpSum(vars_i1 + vars_i2) <= 1, f"NoDouble_{u.id}_{i1.id}_{i2.id}"
-
-    # Solve the model.
-    solver = pulp.PULP_CBC_CMD(msg=False)
-    model.solve(solver)
-    if pulp.LpStatus[model.status] != "Optimal":
-        print("Warning: ILP did not reach an optimal solution. Status:", pulp.LpStatus[model.status])
-        with open("infeasible_model.lp", "w", encoding="utf-8") as f:
-            f.write(str(model))
-        diagnostics.diagnose(issues, users)  # 🧠 Diagnostic trigger
+    # Worker output is captured per component; replay it so it reaches the run log.
+    for result in results:
+        if result["output"]:
+            print(result["output"], end="")
+
+    run_stats = _merge_component_stats(results)
+    print(f"🧮 Model build: {run_stats['build_seconds']:.3f} s for {run_stats['variables']} variables, "
+          f"{run_stats['rows']} rows, {run_stats['nonzeros']} nonzeros in {len(results)} component(s); "
+          f"solve: {run_stats['solve_seconds']:.3f} s")
+
+    if stats is not None:
+        stats["components"] = len(results)
+        stats["parallel"] = use_pool
+        stats["warm_start"] = warm_start
+        stats.update(run_stats)
+
+    if any(result["status"] != "Optimal" for result in results):
+        diagnostics.diagnose(issues, users, index)  # 🧠 Diagnostic trigger
 
         if allow_partial:
             print("🔍 Returning partial assignment...")
-            return algo_greedy.greedy(issues, users)
+            if warm_start:
+                # Components share no users, so their greedy runs add up to the full greedy
+                partial = {}
+                for result in results:
+                    partial.update(result["greedy"])
+                return partial
+            return algo_greedy.greedy(issues, users, index)
         return {}  # No solution found
 
-    # Parse the solution.
+    # Merge the component assignments.
     assignment = {}
-    for ir in issue_roles:
-        i_id = ir["issue_id"]
-        role = ir["role"]
-        if i_id not in assignment:
-            assignment[i_id] = {}
-        if role not in assignment[i_id]:
-            assignment[i_id][role] = []
-        for u in users:
-            key = (i_id, u.id, role)
-            if key in x and pulp.value(x[key]) == 1:
-                if filter_violations.get(key, 0) == 1: # Log if filter was violated for debugging
-                    print(f"⚠️ User {u.id} assigned to issue {i_id}, role {role} despite failing filter")
-                assignment[i_id][role].append(u.id)
+    for result in results:
+        assignment.update(result["assignment"])
 
     # Ensure all issues exist in the assignment dictionary.
     for issue in issues:
         if issue.id not in assignment:
             assignment[issue.id] = {}
+
+    if run_stats["filled_seats"] < run_stats["required_seats"]:
+        # Only possible with soft coverage: the full schedule is infeasible, this is the best partial one.
+        # Keep the wording of the infeasible case, the Redmine side looks for it.
+        print(f"Warning: ILP did not reach an optimal solution. Status: Infeasible — returning the best "
+              f"partial assignment ({run_stats['filled_seats']} of {run_stats['required_seats']} seats filled)")
+        for issue in issues:
+            for req in issue.required_roles:
+                missing = req.required_count - len(assignment[issue.id].get(req.role, []))
+                if missing > 0:
+                    print(f"   ❌ Issue {issue.id} ('{issue.subject}'), role '{req.role}': {missing} seat(s) unfilled")
     return assignment
 
+
+def decompose(issues, index):
+    """
+    Split issues into independent components of the issue-user conflict graph.
+    Two issues interact only if they overlap in time and share a candidate
+    (or forward-assigned) user; otherwise no constraint links their variables.
+    Returns a list of issue lists, each in the original issue order.
+    """
+    parent = list(range(len(issues)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    position = {id(issue): pos for pos, issue in enumerate(issues)}
+    cliques = overlap_cliques((issue, issue.start_datetime, issue.end_datetime) for issue in issues)
+    for clique in cliques:
+        first_issue_of_user = {}
+        for issue in clique:
+            pos = position[id(issue)]
+            for req in issue.required_roles:
+                user_ids = [u.id for u, _, _ in index.candidates(issue.id, req.role)]
+                user_ids += index.forward_assigned(issue.id, req.role)
+                for user_id in user_ids:
+                    other = first_issue_of_user.setdefault(user_id, pos)
+                    root_a, root_b = find(pos), find(other)
+                    if root_a != root_b:
+                        parent[root_a] = root_b
+
+    components = {}
+    for pos, issue in enumerate(issues):
+        components.setdefault(find(pos), []).append(issue)
+    return list(components.values())
+
+
+def _solve_component_job(job):
+    """Process-pool entry point: solve one component and capture its output."""
+    issues, users, index, filter_penalty, warm_start, deadline, gap_rel, solver, soft_coverage = job
+    # What is left of the run's limit; at or below 0 the component falls back to greedy
+    time_limit = deadline - time.time() if deadline is not None else None
+    buffer = io.StringIO()
+    with redirect_stdout(buffer):
+        result = solve_component(issues, users, index, filter_penalty, warm_start, time_limit, gap_rel, solver,
+                                 soft_coverage)
+    result["output"] = buffer.getvalue()
+    return result
+
+
+def _merge_component_stats(results):
+    component_stats = [result["stats"] for result in results]
+    statuses = [result["status"] for result in results]
+    first_incumbents = [s["first_incumbent_seconds"] for s in component_stats]
+    mipstarts = [s["mipstart_accepted"] for s in component_stats if s["mipstart_given"]]
+    objectives = [s["objective"] for s in component_stats]
+    bounds = [s["bound"] for s in component_stats]
+    objective = sum(objectives) if None not in objectives else None
+    bound = sum(bounds) if None not in bounds else None
+    gap = None
+    if objective is not None and bound is not None:
+        gap = abs(bound - objective) / max(abs(objective), 1e-9) if bound != objective else 0.0
+    return {
+        "status": next((s for s in statuses if s != "Optimal"), "Optimal"),
+        "proven_optimal": all(result["proven_optimal"] for result in results),
+        "objective": objective,
+        "bound": bound,
+        "gap": gap,
+        "build_seconds": sum(s["build_seconds"] for s in component_stats),
+        "variables": sum(s["variables"] for s in component_stats),
+        "rows": sum(s["rows"] for s in component_stats),
+        "nonzeros": sum(s["nonzeros"] for s in component_stats),
+        "required_seats": sum(s["required_seats"] for s in component_stats),
+        "filled_seats": sum(s["filled_seats"] for s in component_stats),
+        "solve_seconds": sum(s["solve_seconds"] for s in component_stats),
+        # Only components whose solver looked at a start can accept one (not those presolve
+        # emptied, not HiGHS)
+        "mipstart_accepted": bool(mipstarts) and all(mipstarts),
+        # Every component needs an incumbent before there is one for the whole problem
+        "first_incumbent_seconds": (max(first_incumbents, default=0.0)
+                                    if None not in first_incumbents else None),
+    }
+
+
+def greedy_component(issues, users, index, soft_coverage=False):
+    """
+    solve_component() result for the greedy assignment, used once the time
+    limit leaves no time to solve. Without soft_coverage a greedy assignment
+    that leaves seats open is no solution ('Not Solved').
+    """
+    started = time.perf_counter()
+    assignment = algo_greedy.greedy(issues, users, index)
+    elapsed = time.perf_counter() - started
+    required_seats = sum(req.required_count for issue in issues for req in issue.required_roles)
+    filled_seats = sum(min(len(assignment[issue.id].get(req.role, [])), req.required_count)
+                       for issue in issues for req in issue.required_roles)
+    complete = soft_coverage or filled_seats == required_seats
+    print(f"⏱️ Time limit reached, greedy assignment for {len(issues)} issue(s) "
+          f"({filled_seats} of {required_seats} seats filled)")
+
+    component_stats = {
+        "first_incumbent_seconds": elapsed,
+        "mipstart_accepted": False,
+        "mipstart_given": False,
+        "objective": float(index.total_rating(assignment)),
+        "bound": None,
+        "gap": None,
+        "build_seconds": 0.0,
+        "solve_seconds": elapsed,
+        "variables": 0,
+        "rows": 0,
+        "nonzeros": 0,
+        "required_seats": required_seats,
+        "filled_seats": filled_seats if complete else 0,
+    }
+    return {"status": "Optimal" if complete else "Not Solved", "proven_optimal": False,
+            "assignment": assignment if complete else {}, "greedy": assignment, "stats": component_stats}
+
+
+def solve_component(issues, users, index, filter_penalty=100, warm_start=False, time_limit=None, gap_rel=None,
+                    solver="cbc", soft_coverage=False):
+    """
+    Build and solve the ILP for one independent group of issues.
+    The model is assembled directly as sparse index arrays (SparseModel) and
+    handed to the selected solver backend.
+    With soft_coverage the required counts are upper bounds and every filled
+    seat earns a reward larger than all ratings together, so the optimum fills
+    as many seats as possible and only then maximises the rating.
+    Returns a dict with the LP 'status', whether the solution is
+    'proven_optimal' (False when the time limit or gap stopped the solver early),
+    the 'assignment' (empty unless a solution was found), the warm-start
+    'greedy' assignment (or None) and 'stats'.
+    """
+    if time_limit is not None and time_limit <= 0:
+        return greedy_component(issues, users, index, soft_coverage)
+
+    started = time.perf_counter()
+    user_ids = {u.id for u in users}
+
+    model = SparseModel("Issue_Assignment")
+    x = {}  # Decision variables: keys (issue_id, user_id, role) -> column
+    filter_violations = {}  # Track filter violations: keys (issue_id, user_id, role) -> 0 or 1
+
+    # Create decision variables for qualified and available users, track filter violations.
+    # Objective: maximize total rating, penalize filter violations.
+    for issue in issues:
+        for req_role in issue.required_roles:
+            i_id = issue.id
+            role = req_role.role
+            forward_assigned = index.forward_assigned(i_id, role)
+
+            # First, create variables for forward assigned users without any checks
+            for user_id in forward_assigned:
+                user = index.users_by_id.get(user_id)
+                rating = get_rating(user, role, issue.category) if user else 0
+                filter_violations[(i_id, user_id, role)] = 0  # No filter violations for forward assignments
+                # Forward-assigned users missing from the user list do not count towards the objective
+                x[(i_id, user_id, role)] = model.add_column((i_id, user_id, role), rating if user_id in user_ids else 0)
+
+            # Then create variables for the other candidates from the eligibility index
+            for user, rating, fails_filter in index.candidates(i_id, role):
+                if user.id in forward_assigned:
+                    continue
+
+                # 🚀 **Filter violations are soft: the variable exists, the objective pays for it**
+                filter_violations[(i_id, user.id, role)] = 1 if fails_filter else 0
+                x[(i_id, user.id, role)] = model.add_column(
+                    (i_id, user.id, role), rating - filter_penalty * filter_violations[(i_id, user.id, role)])
+
+    # Coverage reward: one more filled seat outweighs any combination of ratings and penalties.
+    coverage_reward = 1 + float(np.abs(model.costs()).sum())
+
+    # Constraint 1: For each issue-role, assign exactly the required number of users
+    # (at most that many with soft coverage).
+    required_seats = 0
+    coverage_cols = []  # columns earning the coverage reward (soft coverage only)
+    for issue in issues:
+        for req_role in issue.required_roles:
+            i_id = issue.id
+            role = req_role.role
+
+            # If there are forward assignments, ensure they are maintained
+            for user_id in index.forward_assigned(i_id, role):
+                model.add_row(f"ForwardAssign_{i_id}_{user_id}_{role}", [x[(i_id, user_id, role)]], "E", 1)
+
+            cols_for_ir = [x[(i_id, u.id, role)] for u in users if (i_id, u.id, role) in x]
+            if not cols_for_ir:
+                print(f"⚠️ No available users for issue {i_id}, role '{role}' — Debug")
+            required_seats += req_role.required_count
+            if soft_coverage:
+                model.add_cost(cols_for_ir, coverage_reward)
+                coverage_cols.extend(cols_for_ir)
+                model.add_row(f"ReqCount_{i_id}_{role}", cols_for_ir, "L", req_role.required_count)
+            else:
+                model.add_row(f"ReqCount_{i_id}_{role}", cols_for_ir, "E", req_role.required_count)
+
+    # Per-user columns of every issue, used by constraints 2 and 3.
+    issue_user_cols = {}  # issue_id -> {user_id: [columns]}
+    for (i_id, user_id, role), col in x.items():
+        if user_id in user_ids:
+            issue_user_cols.setdefault(i_id, {}).setdefault(user_id, []).append(col)
+
+    # Constraint 2: Prevent same user assigned to multiple roles within one issue
+    for issue in issues:
+        for user_id, cols in issue_user_cols.get(issue.id, {}).items():
+            if len(cols) > 1:
+                model.add_row(f"NoMultiRole_{issue.id}_{user_id}", cols, "L", 1)
+
+    # Constraint 3: A user cannot be double-booked for overlapping issues.
+    # One row per user per maximal clique of overlapping issues covers every
+    # overlapping pair at once (intervals have the Helly property).
+    cliques = overlap_cliques((issue, issue.start_datetime, issue.end_datetime) for issue in issues)
+    for clique_idx, clique in enumerate(cliques):
+        clique_cols = {}
+        for issue in clique:
+            for user_id, cols in issue_user_cols.get(issue.id, {}).items():
+                clique_cols.setdefault(user_id, []).extend(cols)
+        for user_id, cols in clique_cols.items():
+            if len(cols) > 1:
+                model.add_row(f"NoDouble_{user_id}_{clique_idx}", cols, "L", 1)
+
+    # Equal-cost optima are common (repeated shows, equally rated staff) and each
+    # solver would return a different one. A fixed pseudo-random bonus per column,
+    # summing to less than half a rating point, singles out one of them.
+    bonus = np.random.default_rng(TIE_BREAK_SEED).random(model.num_columns)
+    model.set_tie_break(bonus * 0.5 / (required_seats + 1))
+
+    build_seconds = time.perf_counter() - started
+
+    # Warm start: greedy takes milliseconds and hands the solver an incumbent to prune against.
+    greedy_assignment = None
+    initial = None
+    if warm_start:
+        greedy_assignment = algo_greedy.greedy(issues, users, index)
+        initial = np.zeros(model.num_columns, dtype=np.int8)
+        for (i_id, user_id, role), col in x.items():
+            if user_id in greedy_assignment.get(i_id, {}).get(role, []):
+                initial[col] = 1
+
+    solve_started = time.perf_counter()
+    backend = get_backend(solver)
+    solution = backend.solve(model, time_limit=time_limit, gap_rel=gap_rel, initial=initial)
+    solve_seconds = time.perf_counter() - solve_started
+
+    status = solution["status"]
+    proven_optimal = solution["proven_optimal"]
+    if status == "Not Solved" and time_limit is not None:
+        # The limit ran out before the solver had an incumbent
+        return greedy_component(issues, users, index, soft_coverage)
+    component_stats = {key: solution[key] for key in
+                       ("first_incumbent_seconds", "mipstart_accepted", "objective", "bound", "gap")}
+    if solution["values"] is not None:
+        # The solver's objective and bound include the tie-break bonus; report the plan's own value.
+        # The bonus is never negative, so the solver's bound still holds for it.
+        component_stats["objective"] = objective = model.objective(solution["values"])
+        if coverage_cols:
+            # Soft coverage: report the rating alone, comparable with the other strategies;
+            # the coverage itself is filled_seats. The solver's bound mixes both, so it is dropped.
+            covered = int(np.round(solution["values"][coverage_cols]).sum())
+            component_stats["objective"] = objective = objective - coverage_reward * covered
+            component_stats["bound"] = component_stats["gap"] = None
+        if proven_optimal:
+            component_stats["bound"] = objective
+        if component_stats["bound"] is not None:
+            bound = component_stats["bound"]
+            component_stats["gap"] = abs(bound - objective) / max(abs(objective), 1e-9) if bound != objective else 0.0
+    # Whether the solver looked at the warm start at all; see _merge_component_stats
+    component_stats["mipstart_given"] = (initial is not None and backend.takes_mipstart and model.num_columns > 0
+                                         and not solution["presolved"])
+    component_stats["build_seconds"] = build_seconds
+    component_stats["solve_seconds"] = solve_seconds
+    component_stats["variables"] = model.num_columns
+    component_stats["rows"] = model.num_rows
+    component_stats["nonzeros"] = model.num_nonzeros
+    component_stats["required_seats"] = required_seats
+    component_stats["filled_seats"] = 0
+    first_incumbent = solution["first_incumbent_seconds"]
+    if first_incumbent is None and status == "Optimal":
+        # Solved in presolve without a progress line: the whole solve is the upper bound
+        first_incumbent = solve_seconds
+    if first_incumbent is not None:
+        # Wall clock from the start of the component, including model building and greedy
+        component_stats["first_incumbent_seconds"] = (solve_started - started) + first_incumbent
+    result = {"status": status, "proven_optimal": proven_optimal, "assignment": {},
+              "greedy": greedy_assignment, "stats": component_stats}
+
+    if status != "Optimal":
+        print("Warning: ILP did not reach an optimal solution. Status:", status)
+        # One file per component: pool workers may dump several components at once
+        dump_path = f"infeasible_model_{issues[0].id}.mps"
+        model.write_mps(dump_path)
+        print(f"   Model written to {os.path.abspath(dump_path)}")
+        return result
+
+    if not proven_optimal:
+        print("⏱️ Solver stopped early, using the best solution found.")
+        if component_stats["gap"] is not None:
+            print(f"   Objective: {component_stats['objective']}, bound: {component_stats['bound']}, "
+                  f"gap: {component_stats['gap'] * 100:.2f}%")
+
+    # Parse the solution.
+    values = solution["values"]
+    assignment = {}
+    for issue in issues:
+        i_id = issue.id
+        assignment.setdefault(i_id, {})
+        for req_role in issue.required_roles:
+            role = req_role.role
+            assignment[i_id].setdefault(role, [])
+            for u in users:
+                key = (i_id, u.id, role)
+                if key in x and values[x[key]] > 0.5:
+                    if filter_violations.get(key, 0) == 1: # Log if filter was violated for debugging
+                        print(f"⚠️ User {u.id} assigned to issue {i_id}, role {role} despite failing filter")
+                    assignment[i_id][role].append(u.id)
+
+    component_stats["filled_seats"] = sum(
+        min(len(assignment[issue.id][req.role]), req.required_count)
+        for issue in issues for req in issue.required_roles)
+    result["assignment"] = assignment
+    return result
+
+
 # Example usage:
 if __name__ == "__main__": 
     issues = []
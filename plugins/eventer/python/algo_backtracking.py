@@ -1,120 +1,432 @@
+import multiprocessing
+import os
+import time
+from bisect import bisect_left, bisect_right
+from concurrent.futures import ProcessPoolExecutor
 from datetime import timedelta
 from models import User, Issue
+from eligibility import EligibilityIndex, get_rating
+
+# Exhaustive searches on at least this many issues run in a process pool by default.
+PARALLEL_MIN_ISSUES = 12
+# Subtrees per worker the split aims for; extra ones keep workers busy when subtree sizes differ.
+SUBPROBLEMS_PER_WORKER = 4
+# The split places at most this many users up front...
+MAX_SPLIT_SEATS = 8
+# ...and stops deepening once it would produce more than this many times the target.
+SPLIT_LIMIT_FACTOR = 16
 
 def is_time_overlap(s1, e1, s2, e2):
     e1 = e1 if e1 is not None else s1 + timedelta(hours=3)
     e2 = e2 if e2 is not None else s2 + timedelta(hours=3)
     return (s1 < e2) and (s2 < e1)
 
-def get_rating(user, role, category):
-    for q in user.qualifications:
-        if q.role == role and (category is None or q.category == category):
-            return q.rating
-    return 0
+class RatingBound:
+    """
+    Upper bound on the rating still obtainable from issue position p onward:
+    the sum over the remaining (issue, role) slots of the top-k ratings among
+    candidates not blocked by a booking on an earlier, overlapping issue.
+
+    Slot sums live in a Fenwick tree over issue positions, so the suffix sum
+    is O(log I). Booking a user only recomputes the later slots that user is
+    a candidate for and whose issue overlaps the booked one.
+    """
+
+    def __init__(self, issues, index, intervals):
+        self._intervals = intervals  # issue position -> (start, end)
+        self._tree = [0] * (len(issues) + 1)
+        self._slots = []             # slot -> (position, [(user_id, rating)] best first, required_count)
+        self._slot_sum = []
+        self._blocked = []           # slot -> {user_id: number of blocking bookings}
+        self._user_slots = {}        # user_id -> [slot]
+
+        for pos, issue in enumerate(issues):
+            for role in issue.required_roles:
+                slot = len(self._slots)
+                ranked = [(u.id, rating) for u, rating, _ in index.ranked(issue.id, role.role)]
+                self._slots.append((pos, ranked, role.required_count))
+                self._blocked.append({})
+                self._slot_sum.append(0)
+                for user_id, _ in ranked:
+                    self._user_slots.setdefault(user_id, []).append(slot)
+                self._refresh(slot)
+
+        # Each user's slots sorted by issue start, so a booking only looks at
+        # the slots starting within one issue length before it ends
+        self._user_starts = {}
+        for user_id, slots in self._user_slots.items():
+            slots.sort(key=lambda slot: self._intervals[self._slots[slot][0]][0])
+            self._user_starts[user_id] = [self._intervals[self._slots[slot][0]][0] for slot in slots]
+        self._max_duration = max((end - start for start, end in intervals), default=timedelta(0))
+
+    def _add(self, pos, delta):
+        pos += 1
+        while pos < len(self._tree):
+            self._tree[pos] += delta
+            pos += pos & -pos
+
+    def _prefix(self, pos):
+        """Sum of slot bounds on issue positions < pos."""
+        total = 0
+        while pos > 0:
+            total += self._tree[pos]
+            pos -= pos & -pos
+        return total
+
+    def _refresh(self, slot):
+        pos, ranked, required_count = self._slots[slot]
+        blocked = self._blocked[slot]
+        ratings = [rating for user_id, rating in ranked if not blocked.get(user_id)][:required_count]
+        delta = sum(ratings) - self._slot_sum[slot]
+        if delta:
+            self._slot_sum[slot] += delta
+            self._add(pos, delta)
+
+    def conflicting_slots(self, user_id, pos):
+        """Slots of later issues overlapping issue `pos` that the user is a candidate for."""
+        start, end = self._intervals[pos]
+        slots = self._user_slots.get(user_id, [])
+        starts = self._user_starts.get(user_id, [])
+        return [slots[i] for i in range(bisect_right(starts, start - self._max_duration), bisect_left(starts, end))
+                if self._slots[slots[i]][0] > pos
+                and is_time_overlap(start, end, *self._intervals[self._slots[slots[i]][0]])]
+
+    def book(self, user_id, pos, slots=None):
+        """Block the user in the later overlapping slots (`slots` if already looked up)."""
+        for slot in self.conflicting_slots(user_id, pos) if slots is None else slots:
+            blocked = self._blocked[slot]
+            blocked[user_id] = blocked.get(user_id, 0) + 1
+            if blocked[user_id] == 1:
+                self._refresh(slot)
+
+    def unbook(self, user_id, pos, slots=None):
+        for slot in self.conflicting_slots(user_id, pos) if slots is None else slots:
+            blocked = self._blocked[slot]
+            blocked[user_id] -= 1
+            if blocked[user_id] == 0:
+                del blocked[user_id]
+                self._refresh(slot)
+
+    def remaining(self, pos):
+        """Bound on the rating obtainable from issues at positions >= pos."""
+        return self._prefix(len(self._tree) - 1) - self._prefix(pos)
+
+
+def backtracking_basic(issues, users, index=None, stats=None, max_nodes=None, time_limit=None, exhaustive=False,
+                       max_workers=None):
+    """
+    Depth-first search over the issues in list order, staffing each role with
+    the best-rated valid users. Only complete assignments (every role fully
+    staffed) count; the best one found is returned, or {} if there is none.
+    The search runs on an explicit stack of placed users, so its depth is not
+    bounded by Python's recursion limit.
+    Args:
+        issues: List of Issue objects.
+        users: List of User objects.
+        index: EligibilityIndex for issues/users, built here if not given.
+        stats: Optional dict filled with 'nodes', 'solve_seconds', 'complete'
+            and 'subproblems' (1 unless the search ran in parallel).
+        max_nodes: Stop after entering this many issues (search nodes); in
+            parallel mode the budget applies to every subproblem.
+        time_limit: Stop after this many seconds.
+        exhaustive: If False (default) each issue gets its first feasible staffing
+            and a dead end ends the search. If True every staffing is tried
+            (branch and bound against RatingBound), which makes the result optimal
+            when the search completes.
+        max_workers: Worker processes for an exhaustive search. None uses every
+            CPU once there are PARALLEL_MIN_ISSUES issues, 1 always searches in-process.
+    Returns:
+        Dictionary: { issue_id: { role_name: [list_of_assigned_user_ids] } }
+    """
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
+    started = time.perf_counter()
+    search = BranchAndBound(issues, index, exhaustive=exhaustive)
+
+    workers = max_workers or os.cpu_count() or 1
+    subproblems = None
+    if exhaustive and workers > 1 and (max_workers is not None or len(issues) >= PARALLEL_MIN_ISSUES):
+        subproblems = search.split(workers * SUBPROBLEMS_PER_WORKER)
+
+    if subproblems and len(subproblems) > 1:
+        print(f"🧩 Searching {len(subproblems)} subtrees on {workers} worker processes...")
+        best_assignment, nodes, complete = _parallel_search(issues, index, subproblems, workers,
+                                                            max_nodes, time_limit)
+    else:
+        best_assignment, _ = search.run(max_nodes=max_nodes, time_limit=time_limit)
+        nodes, complete = search.nodes, search.complete
+    elapsed = time.perf_counter() - started
+
+    if not complete:
+        print(f"⏱️ Backtracking stopped after {nodes} nodes, returning the best assignment found")
+    print(f"🔁 Backtracking explored {nodes} nodes in {elapsed:.3f} s")
+    if stats is not None:
+        stats["nodes"] = nodes
+        stats["solve_seconds"] = elapsed
+        stats["complete"] = complete
+        stats["subproblems"] = len(subproblems) if subproblems and len(subproblems) > 1 else 1
+    return best_assignment
+
 
-def backtracking_basic(issues, users):
-    best_assignment = [{}]
-    best_total_rating = [0]
-    current_assignment = {}
-    user_schedule = {user.id: [] for user in users}
-    current_rating = [0]
-    recursion_count = [0]
+# Per-process state of the parallel search, set once by the pool initializer
+_worker_state = {}
 
-    def is_valid(user, issue, role):
-        if get_rating(user, role.role, issue.category) <= 0:
-            return False
 
-        start = issue.start_datetime
-        end = issue.end_datetime or start + timedelta(hours=1)
+def _init_worker(issues, index, shared_best, deadline, max_nodes):
+    _worker_state.update(issues=issues, index=index, shared_best=shared_best, deadline=deadline,
+                         max_nodes=max_nodes)
 
-        for od in user.off_days:
-            if not (end <= od.start_datetime or start >= od.end_datetime):
-                return False
 
-        for s, e in user_schedule[user.id]:
-            if is_time_overlap(s, e, start, end):
-                return False
+def _search_subproblem(prefix):
+    """Process-pool entry point: search the subtree below one placement prefix."""
+    state = _worker_state
+    search = BranchAndBound(state["issues"], state["index"], exhaustive=True)
+    time_limit = None
+    if state["deadline"] is not None:
+        time_limit = max(state["deadline"] - time.time(), 0.0)
+    assignment, rating = search.run(max_nodes=state["max_nodes"], time_limit=time_limit, prefix=prefix,
+                                    shared_best=state["shared_best"])
+    return assignment, rating, search.nodes, search.complete
 
-        if any(user.id in uids for uids in current_assignment.get(issue.id, {}).values()):
-            return False
 
-        return True
+def _parallel_search(issues, index, subproblems, workers, max_nodes, time_limit):
+    """
+    Search the subtrees below `subproblems` in a process pool. Workers publish
+    every better complete assignment to a shared incumbent and prune against
+    it. Returns (best_assignment, nodes, complete).
+    """
+    shared_best = multiprocessing.Value("d", 0.0)
+    deadline = time.time() + time_limit if time_limit is not None else None
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(issues, index, shared_best, deadline, max_nodes)) as pool:
+        results = list(pool.map(_search_subproblem, subproblems))
 
-    def compute_max_possible_rating(issue_idx):
-        max_rating = current_rating[0]
-        for i in range(issue_idx, len(issues)):
-            issue = issues[i]
+    best_assignment, best_rating = {}, 0
+    for assignment, rating, _, _ in results:  # subtrees in search order, so ties keep the first
+        if assignment and rating > best_rating:
+            best_assignment, best_rating = assignment, rating
+    return best_assignment, sum(r[2] for r in results), all(r[3] for r in results)
+
+
+class BranchAndBound:
+    """
+    Iterative depth-first search over seats, one seat per required user of
+    every (issue, role). A stack of placements doubles as the undo log: each
+    entry records the seat and the candidate index it took, so backtracking
+    pops it, releases the user and resumes with the next candidate.
+    Users of one role are picked in ranked order, so every staffing of a role
+    is visited once.
+
+    Every (issue, role) slot keeps its live candidate domain as an integer
+    bitmask of user indices. Placing a user clears their bit in the other
+    slots of the issue and in every later overlapping slot (forward checking),
+    so a validity check is a single AND, and a slot left with fewer candidates
+    than open seats is a dead end detected right away.
+    """
+
+    def __init__(self, issues, index, exhaustive=False):
+        self.issues = issues
+        self.index = index
+        self.exhaustive = exhaustive
+        self.intervals = [
+            (issue.start_datetime, issue.end_datetime or issue.start_datetime + timedelta(hours=1))
+            for issue in issues
+        ]
+        self.bound = RatingBound(issues, index, self.intervals)
+        self.bits = {}         # user_id -> single-bit mask
+        self.live = []         # slot -> bitmask of users that can still take it
+        self.open_seats = []   # slot -> seats still to fill
+        self.issue_slots = []  # issue position -> [slot]
+        self.changes = []      # undo log per placement: (narrowed slots, conflicting later slots)
+
+        # seat -> (issue position, role name, [(user_id, rating)] best first, previous seat of the same role, slot)
+        # Slots are numbered like RatingBound's: issues in order, roles in order.
+        self.seats = []
+        for pos, issue in enumerate(issues):
+            self.issue_slots.append([])
             for role in issue.required_roles:
-                available_users = [u for u in users if is_valid(u, issue, role)]
-                ratings = sorted(
-                    [get_rating(u, role.role, issue.category) for u in available_users],
-                    reverse=True
-                )[:role.required_count]
-                max_rating += sum(ratings)
-        return max_rating
-
-    def backtrack(issue_idx):
-        recursion_count[0] += 1
-        if issue_idx == len(issues):
-            if current_rating[0] > best_total_rating[0]:
-                best_total_rating[0] = current_rating[0]
-                best_assignment[0] = {
-                    issue_id: {role: list(user_ids) for role, user_ids in roles.items()}
-                    for issue_id, roles in current_assignment.items()
-                }
-            return
-        if compute_max_possible_rating(issue_idx) <= best_total_rating[0]:
-            return
-
-        issue = issues[issue_idx]
-        current_assignment[issue.id] = {}
-
-        if assign_roles(issue, 0):
-            backtrack(issue_idx + 1)
-        for role in issue.required_roles:
-            for user_id in current_assignment[issue.id].get(role.role, []):
-                user_schedule[user_id].pop()
-        del current_assignment[issue.id]
-
-    def assign_roles(issue, role_idx):
-        if role_idx == len(issue.required_roles):
-            return True
-
-        role = issue.required_roles[role_idx]
-        assigned = []
-
-        available_users = [u for u in users if is_valid(u, issue, role)]
-        sorted_users = sorted(
-            available_users,
-            key=lambda u: get_rating(u, role.role, issue.category),
-            reverse=True
-        )
-
-        if assign_users(issue, role, sorted_users, 0, assigned):
-            current_assignment[issue.id][role.role] = assigned
-            if assign_roles(issue, role_idx + 1):
-                return True
-            for user_id in assigned:
-                user_schedule[user_id].pop()
-            del current_assignment[issue.id][role.role]
-        return False
-
-    def assign_users(issue, role, sorted_users, user_idx, assigned):
-        if len(assigned) == role.required_count:
-            return True
-
-        for i in range(user_idx, len(sorted_users)):
-            user = sorted_users[i]
-            assigned.append(user.id)
-            end_time = issue.end_datetime or issue.start_datetime + timedelta(hours=1)
-            user_schedule[user.id].append((issue.start_datetime, end_time))
-            current_rating[0] += get_rating(user, role.role, issue.category)
-            if assign_users(issue, role, sorted_users, i + 1, assigned):
-                return True
-            assigned.pop()
-            user_schedule[user.id].pop()
-            current_rating[0] -= get_rating(user, role.role, issue.category)
-        return False
-
-    backtrack(0)
-    return best_assignment[0]
\ No newline at end of file
+                slot = len(self.live)
+                ranked = [(u.id, rating) for u, rating, _ in index.ranked(issue.id, role.role)]
+                domain = 0
+                for user_id, _ in ranked:
+                    domain |= self.bits.setdefault(user_id, 1 << len(self.bits))
+                self.live.append(domain)
+                self.open_seats.append(role.required_count)
+                self.issue_slots[pos].append(slot)
+                for k in range(role.required_count):
+                    self.seats.append((pos, role.role, ranked, k > 0, slot))
+
+        self.rating = 0
+        self.nodes = 0
+        self.complete = True
+        self.elapsed = 0.0
+
+    def _place(self, seat, user_id, rating):
+        """Place the user; returns False if some slot can no longer be filled."""
+        pos, slot = self.seats[seat][0], self.seats[seat][4]
+        bit = self.bits[user_id]
+        live = self.live
+        conflicting = self.bound.conflicting_slots(user_id, pos)
+        narrowed = []
+        for slots in (self.issue_slots[pos], conflicting):
+            for other in slots:
+                if live[other] & bit:
+                    live[other] &= ~bit
+                    narrowed.append(other)
+        self.changes.append((narrowed, conflicting))
+        self.open_seats[slot] -= 1
+        self.bound.book(user_id, pos, conflicting)
+        self.rating += rating
+        open_seats = self.open_seats
+        return all(bin(live[other]).count("1") >= open_seats[other] for other in narrowed)
+
+    def _release(self, seat, user_id, rating):
+        pos, slot = self.seats[seat][0], self.seats[seat][4]
+        bit = self.bits[user_id]
+        narrowed, conflicting = self.changes.pop()
+        for other in narrowed:
+            self.live[other] |= bit
+        self.open_seats[slot] += 1
+        self.bound.unbook(user_id, pos, conflicting)
+        self.rating -= rating
+
+    def _next_candidate(self, seat, start):
+        """First candidate index >= start that can take the seat, or None."""
+        ranked, slot = self.seats[seat][2], self.seats[seat][4]
+        live = self.live[slot]
+        bits = self.bits
+        for i in range(start, len(ranked)):
+            if live & bits[ranked[i][0]]:
+                return i
+        return None
+
+    def _snapshot(self, stack):
+        assignment = {issue.id: {role.role: [] for role in issue.required_roles} for issue in self.issues}
+        for seat, cand in stack:
+            pos, role, ranked = self.seats[seat][:3]
+            assignment[self.issues[pos].id][role].append(ranked[cand][0])
+        return assignment
+
+    def _advance(self, seat, cand, stack):
+        """
+        Place candidate `cand` on `seat`. Returns the next (seat, start) and
+        whether every slot can still be filled.
+        """
+        feasible = self._place(seat, *self.seats[seat][2][cand])
+        stack.append((seat, cand))
+        seat += 1
+        # Later seats of the same role continue after this candidate
+        return seat, (cand + 1 if seat < len(self.seats) and self.seats[seat][3] else 0), feasible
+
+    def _retreat(self, stack):
+        """Undo the last placement; returns the (seat, start) to resume from."""
+        seat, cand = stack.pop()
+        self._release(seat, *self.seats[seat][2][cand])
+        return seat, cand + 1
+
+    def split(self, target):
+        """
+        Placement prefixes covering the first few seats, to be searched as
+        independent subtrees. Goes one seat deeper at a time (at most
+        MAX_SPLIT_SEATS) until there are `target` prefixes, and keeps the last
+        depth that did not grow past SPLIT_LIMIT_FACTOR * target.
+        """
+        prefixes = None
+        for depth in range(1, min(len(self.seats), MAX_SPLIT_SEATS) + 1):
+            deeper = self._enumerate(depth, SPLIT_LIMIT_FACTOR * target)
+            if deeper is None:
+                break
+            prefixes = deeper
+            if len(prefixes) >= target:
+                break
+        return prefixes
+
+    def _enumerate(self, depth, limit):
+        """Every feasible placement of seats [0, depth), or None if there are more than `limit`."""
+        prefixes, stack = [], []
+        seat, start = 0, 0
+        while True:
+            cand = None
+            if seat == depth:
+                prefixes.append(tuple(stack))
+                if len(prefixes) > limit:
+                    prefixes = None
+                    break
+            else:
+                cand = self._next_candidate(seat, start)
+            if cand is not None:
+                seat, start, feasible = self._advance(seat, cand, stack)
+                if not feasible:
+                    seat, start = self._retreat(stack)
+            elif stack:
+                seat, start = self._retreat(stack)
+            else:
+                break
+        while stack:
+            self._retreat(stack)
+        return prefixes
+
+    def run(self, max_nodes=None, time_limit=None, incumbent=0, prefix=(), shared_best=None):
+        """
+        Search until done or out of budget. Returns (best_assignment, best_rating);
+        the assignment is {} when no complete assignment beat `incumbent`.
+        With a `prefix` of placements only the subtree below it is searched.
+        `shared_best` (a multiprocessing.Value) is an incumbent shared with other
+        searches: it is used for pruning and raised by every better leaf.
+        """
+        started = time.perf_counter()
+        deadline = started + time_limit if time_limit is not None else None
+        best_assignment, best_rating = {}, incumbent
+        stack = []   # (seat, candidate index) of every placed user
+        seat, start = 0, 0
+        for prefix_seat, cand in prefix:
+            seat, start, _ = self._advance(prefix_seat, cand, stack)
+        floor = len(stack)
+        steps = 0
+
+        while True:
+            steps += 1
+            if (max_nodes is not None and self.nodes >= max_nodes) or \
+                    (deadline is not None and steps % 256 == 0 and time.perf_counter() > deadline):
+                self.complete = False
+                break
+
+            backtrack = False
+            if seat == len(self.seats):
+                # Leaf: every seat is filled
+                self.nodes += 1
+                if self.rating > best_rating and (shared_best is None or self.rating > shared_best.value):
+                    best_rating = self.rating
+                    best_assignment = self._snapshot(stack)
+                    if shared_best is not None:
+                        with shared_best.get_lock():
+                            shared_best.value = max(shared_best.value, best_rating)
+                backtrack = True
+            else:
+                pos = self.seats[seat][0]
+                if start == 0 and (seat == 0 or self.seats[seat - 1][0] != pos):
+                    # Entering an issue: prune if it cannot beat the incumbent
+                    self.nodes += 1
+                    limit = best_rating if shared_best is None else max(best_rating, shared_best.value)
+                    if self.rating + self.bound.remaining(pos) <= limit:
+                        backtrack = True
+                if not backtrack:
+                    cand = self._next_candidate(seat, start)
+                    if cand is None:
+                        backtrack = True
+                    else:
+                        seat, start, feasible = self._advance(seat, cand, stack)
+                        # A slot ran out of candidates: the subtree is dead, no need to walk into it
+                        backtrack = not feasible
+
+            if backtrack:
+                if not self.exhaustive or len(stack) == floor:
+                    break  # first-fit mode never revisits a choice
+                seat, start = self._retreat(stack)
+
+        # Leave the shared state clean for another run
+        while stack:
+            self._retreat(stack)
+        self.elapsed = time.perf_counter() - started
+        return best_assignment, best_rating
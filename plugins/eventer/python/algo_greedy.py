@@ -1,19 +1,33 @@
+import heapq
+import time
 from datetime import timedelta
 from models import User, Issue
-from filter_eval import evaluate_filter_block
+from eligibility import EligibilityIndex
+from schedule import Schedules
 
+# Default wall-clock budget of the local-search pass, in seconds
+DEFAULT_IMPROVE_SECONDS = 1.0
 
-def greedy(issues, users):
+
+def greedy(issues, users, index=None, improve_seconds=None):
     """
     Greedy assignment of users to issues with constraint checking.
+    Qualification, availability and custom filters come from the
+    EligibilityIndex (built here if not given).
+    With improve_seconds the result is refined by local_search() for at most
+    that many seconds.
     Returns a dictionary: { issue_id: { role_name: [list_of_assigned_user_ids] } }
     """
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
     assignment = {}
-    user_assignments = []
+    schedules = Schedules()  # per-user busy intervals for the double-booking check
 
     for issue in sorted(issues, key=lambda i: i.start_datetime):
         assignment[issue.id] = {}
         issue_end = issue.end_datetime or issue.start_datetime + timedelta(hours=3)
+        in_issue = set()  # users already holding a role in this issue
 
         for req_role in issue.required_roles:
             role = req_role.role
@@ -24,63 +38,312 @@ def greedy(issues, users):
             forward_assigned = [u.id for u in req_role.assigned_users]
             for user_id in forward_assigned:
                 assigned_users.append(user_id)
-                user_assignments.append((user_id, issue.start_datetime, issue_end))
+                schedules.add(user_id, issue.start_datetime, issue_end)
+            in_issue.update(forward_assigned)
 
-            # If we still need more users, look for additional candidates
-            if len(assigned_users) < count_needed:
-                candidates = []
-                for user in users:
-                    if user.id in assigned_users:
+            # If we still need more users, take the best-rated free candidates
+            # (ranked() is the stable rating order, so ties keep the user order)
+            remaining_needed = count_needed - len(assigned_users)
+            if remaining_needed > 0:
+                for user, rating, fails_filter in index.ranked(issue.id, role):
+                    # Custom filters are hard constraints for the greedy
+                    if fails_filter or user.id in in_issue:
+                        continue
+                    if schedules.overlaps(user.id, issue.start_datetime, issue_end):
                         continue
 
-                    if any(q.role == role and (issue.category is None or q.category == issue.category)
-                           for q in user.qualifications):
-
-                        if not user.is_available(issue.start_datetime, issue_end):
-                            continue
-
-                        has_conflict = any(
-                            (user.id == u_id and times_overlap(issue.start_datetime, issue_end, s, e))
-                            for (u_id, s, e) in user_assignments
-                        )
-                        if has_conflict:
-                            continue
-
-                        context = {
-                            "category": issue.category,
-                            "start_time": issue.start_datetime,
-                            "end_time": issue_end,
-                            "assigned_users": []
-                        }
-                        if any(not evaluate_filter_block(cf.conditions, context) for cf in user.custom_filters):
-                            continue
-
-                        already_in_issue = any(
-                            user.id in users_for_role
-                            for r, users_for_role in assignment[issue.id].items()
-                        )
-                        if already_in_issue:
-                            continue
-
-                        rating = 0
-                        for q in user.qualifications:
-                            if q.role == role and (issue.category is None or q.category == issue.category):
-                                rating = q.rating
-                                break
-
-                        candidates.append((user, rating))
-
-                # Sort candidates by rating (descending)
-                candidates.sort(key=lambda t: t[1], reverse=True)
-
-                # Assign remaining needed users
-                remaining_needed = count_needed - len(assigned_users)
-                for user, _ in candidates[:remaining_needed]:
                     assigned_users.append(user.id)
-                    user_assignments.append((user.id, issue.start_datetime, issue_end))
+                    in_issue.add(user.id)
+                    schedules.add(user.id, issue.start_datetime, issue_end)
+                    remaining_needed -= 1
+                    if remaining_needed == 0:
+                        break
 
             assignment[issue.id][role] = assigned_users
 
+    if improve_seconds is not None:
+        return local_search(issues, assignment, index, improve_seconds)
+    return assignment
+
+
+def local_search(issues, assignment, index, time_budget=DEFAULT_IMPROVE_SECONDS):
+    """
+    Improve an assignment with fill, replace and swap moves until no move
+    helps or `time_budget` seconds have passed:
+      - fill: give an open seat to a free candidate, or to a busy one whose
+        clashing seat a free user can take over,
+      - replace: hand a seat to a free, better-rated candidate,
+      - swap: exchange two users between roles (of the same issue or of two
+        overlapping issues) when that raises the total rating.
+    Moves follow the greedy rules (qualification, availability, custom filters,
+    no double booking, one role per issue) and forward assignments never move.
+    Each move is checked against per-user schedules and scored by its rating
+    delta; the assignment is never re-evaluated as a whole.
+    Returns a new assignment dict, the input is left untouched.
+    """
+    started = time.perf_counter()
+    deadline = started + time_budget
+    result = {issue_id: {role: list(user_ids) for role, user_ids in roles.items()}
+              for issue_id, roles in assignment.items()}
+
+    intervals = {}   # issue_id -> (start, end)
+    fixed = set()    # (issue_id, role, user_id) of forward assignments
+    schedules = Schedules()
+    in_issue = {}    # issue_id -> {user_id: role}
+    bookings = {}    # user_id -> {(issue_id, role)}
+
+    def book(user_id, issue_id, role):
+        schedules.add(user_id, *intervals[issue_id])
+        in_issue[issue_id][user_id] = role
+        bookings.setdefault(user_id, set()).add((issue_id, role))
+
+    def unbook(user_id, issue_id, role):
+        schedules.remove(user_id, *intervals[issue_id])
+        del in_issue[issue_id][user_id]
+        bookings[user_id].discard((issue_id, role))
+
+    def is_free(user_id, issue_id, leaving=None):
+        """Can the user take issue_id, after giving up its booking on `leaving`?"""
+        if leaving is not None:
+            schedules.remove(user_id, *intervals[leaving])
+        free = not schedules.overlaps(user_id, *intervals[issue_id])
+        if leaving is not None:
+            schedules.add(user_id, *intervals[leaving])
+        return free
+
+    def overlapping(issue_a, issue_b):
+        start_a, end_a = intervals[issue_a]
+        start_b, end_b = intervals[issue_b]
+        return start_a < end_b and start_b < end_a
+
+    for issue in issues:
+        start = issue.start_datetime
+        intervals[issue.id] = (start, issue.end_datetime or start + timedelta(hours=3))
+        in_issue[issue.id] = {}
+    for issue in issues:
+        roles = result.setdefault(issue.id, {})
+        for req_role in issue.required_roles:
+            fixed.update((issue.id, req_role.role, u.id) for u in req_role.assigned_users)
+            for user_id in roles.setdefault(req_role.role, []):
+                book(user_id, issue.id, req_role.role)
+
+    def single_clash(user_id, issue_id):
+        """The one movable booking keeping the user from issue_id, or None."""
+        if user_id in in_issue[issue_id]:
+            clashes = [(issue_id, in_issue[issue_id][user_id])]
+        else:
+            clashes = [b for b in bookings.get(user_id, ()) if overlapping(b[0], issue_id)]
+        if len(clashes) != 1 or (clashes[0][0], clashes[0][1], user_id) in fixed:
+            return None
+        return clashes[0]
+
+    def try_shift(issue_id, role, other_id):
+        """Fill an open seat with other_id and hand other_id's clashing seat to a free user."""
+        clash = single_clash(other_id, issue_id)
+        if clash is None:
+            return False
+        other_issue, other_role = clash
+        for user, _, fails_filter in index.ranked(other_issue, other_role):
+            if fails_filter or user.id == other_id or user.id in in_issue[other_issue]:
+                continue
+            if not is_free(user.id, other_issue):
+                continue
+            other_seats = result[other_issue][other_role]
+            unbook(other_id, other_issue, other_role)
+            other_seats[other_seats.index(other_id)] = user.id
+            book(user.id, other_issue, other_role)
+            result[issue_id][role].append(other_id)
+            book(other_id, issue_id, role)
+            return True
+        return False
+
+    def try_swap(issue_id, role, pos, other_id, other_rating):
+        """Give seat `pos` of (issue_id, role) to other_id and its clashing seat to the current holder."""
+        user_id = result[issue_id][role][pos]
+        clash = single_clash(other_id, issue_id)
+        if clash is None:
+            return False
+        other_issue, other_role = clash
+        if not index.is_candidate(other_issue, user_id, other_role) or index.fails_filter(other_issue, user_id, other_role):
+            return False
+        if other_issue != issue_id:
+            if user_id in in_issue[other_issue] or not is_free(user_id, other_issue, leaving=issue_id):
+                return False
+
+        delta = (other_rating + index.rating(other_issue, user_id, other_role)
+                 - index.rating(issue_id, user_id, role) - index.rating(other_issue, other_id, other_role))
+        if delta <= 1e-9:
+            return False
+
+        other_seats = result[other_issue][other_role]
+        unbook(user_id, issue_id, role)
+        unbook(other_id, other_issue, other_role)
+        result[issue_id][role][pos] = other_id
+        other_seats[other_seats.index(other_id)] = user_id
+        book(other_id, issue_id, role)
+        book(user_id, other_issue, other_role)
+        return True
+
+    def improve_slot(issue_id, role, required_count):
+        seats = result[issue_id][role]
+        changed = False
+
+        # Fill open seats with the best free candidates, or with a busy one whose
+        # clashing seat someone free can take over
+        if len(seats) < required_count:
+            for user, rating, fails_filter in index.ranked(issue_id, role):
+                if len(seats) >= required_count:
+                    break
+                if fails_filter:
+                    continue
+                if user.id not in in_issue[issue_id] and is_free(user.id, issue_id):
+                    seats.append(user.id)
+                    book(user.id, issue_id, role)
+                    changed = True
+                elif try_shift(issue_id, role, user.id):
+                    changed = True
+
+        # Replace or swap every movable holder with a better-rated candidate
+        for pos in range(len(seats)):
+            user_id = seats[pos]
+            if (issue_id, role, user_id) in fixed:
+                continue
+            current = index.rating(issue_id, user_id, role)
+            for user, rating, fails_filter in index.ranked(issue_id, role):
+                if rating <= current:
+                    break  # ranked best first, nobody better left
+                if fails_filter:
+                    continue
+                if user.id not in in_issue[issue_id] and is_free(user.id, issue_id):
+                    unbook(user_id, issue_id, role)
+                    seats[pos] = user.id
+                    book(user.id, issue_id, role)
+                    changed = True
+                    break
+                if try_swap(issue_id, role, pos, user.id, rating):
+                    changed = True
+                    break
+        return changed
+
+    moves_made = True
+    passes = 0
+    while moves_made and time.perf_counter() < deadline:
+        moves_made = False
+        passes += 1
+        for issue in issues:
+            if time.perf_counter() >= deadline:
+                break
+            for req_role in issue.required_roles:
+                if improve_slot(issue.id, req_role.role, req_role.required_count):
+                    moves_made = True
+
+    print(f"🔧 Local search: rating {index.total_rating(assignment)} → {index.total_rating(result)} "
+          f"in {passes} pass(es), {time.perf_counter() - started:.3f} s")
+    return result
+
+
+def greedy_regret(issues, users, index=None):
+    """
+    Regret-based greedy assignment of users to issues.
+    Open (issue, role) slots sit in a priority queue: the slot with the fewest
+    spare candidates comes first, ties go to the slot that loses most rating
+    if its best choice is taken elsewhere (the regret), then to the earlier
+    slot. The slot at the front takes all its seats at once, and only the
+    slots that just lost those users are re-prioritised, so scarce
+    specialists are kept for the slots that need them.
+    Custom filters are hard constraints, as in greedy().
+    Returns a dictionary: { issue_id: { role_name: [list_of_assigned_user_ids] } }
+    """
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
+    assignment = {}
+    schedules = Schedules()
+    intervals = {}  # issue_id -> (start, end)
+    in_issue = {}   # issue_id -> users already holding a role in the issue
+    need = {}       # (issue_id, role) -> seats still open
+    order = {}      # (issue_id, role) -> position, the final tie-break
+
+    for issue in sorted(issues, key=lambda i: i.start_datetime):
+        start = issue.start_datetime
+        intervals[issue.id] = (start, issue.end_datetime or start + timedelta(hours=3))
+        assignment[issue.id] = {}
+        in_issue[issue.id] = set()
+
+        # Forward assignments are fixed and book their users before anything else
+        for req_role in issue.required_roles:
+            forward_assigned = [u.id for u in req_role.assigned_users]
+            assignment[issue.id][req_role.role] = list(forward_assigned)
+            in_issue[issue.id].update(forward_assigned)
+            for user_id in forward_assigned:
+                schedules.add(user_id, *intervals[issue.id])
+
+            slot = (issue.id, req_role.role)
+            need[slot] = req_role.required_count - len(forward_assigned)
+            order[slot] = len(order)
+
+    # Slots each user could fill, to find the slots a booking affects
+    user_slots = {}
+    for slot in need:
+        for user, _, fails_filter in index.ranked(*slot):
+            if not fails_filter:
+                user_slots.setdefault(user.id, []).append(slot)
+
+    def feasible(slot):
+        issue_id, role = slot
+        start, end = intervals[issue_id]
+        return [(user, rating) for user, rating, fails_filter in index.ranked(issue_id, role)
+                if not fails_filter and user.id not in in_issue[issue_id]
+                and not schedules.overlaps(user.id, start, end)]
+
+    def priority(slot, candidates):
+        seats = need[slot]
+        spare = len(candidates) - seats
+        if spare > 0:
+            # Rating lost if the last seat has to go to the next candidate
+            regret = candidates[seats - 1][1] - candidates[seats][1]
+        else:
+            regret = candidates[-1][1] if candidates else 0
+        # Scarcest slot first, then the larger regret; start time only breaks what is left
+        return (spare, -regret, intervals[slot[0]][0], order[slot])
+
+    version = dict.fromkeys(need, 0)
+    heap = []
+    for slot, seats in need.items():
+        if seats > 0:
+            heapq.heappush(heap, (priority(slot, feasible(slot)), 0, slot))
+
+    while heap:
+        _, slot_version, slot = heapq.heappop(heap)
+        if slot_version != version[slot] or need[slot] <= 0:
+            continue  # stale entry
+
+        candidates = feasible(slot)
+        if not candidates:
+            need[slot] = 0  # nobody left, the seat stays open
+            continue
+
+        # Fill every open seat of the slot now: its priority was taken on the last
+        # seat, and a half-filled slot would look less scarce than it is
+        issue_id, role = slot
+        start, end = intervals[issue_id]
+        booked = [user for user, _ in candidates[:need[slot]]]
+        for user in booked:
+            assignment[issue_id][role].append(user.id)
+            in_issue[issue_id].add(user.id)
+            schedules.add(user.id, start, end)
+        need[slot] = 0  # seats nobody could take stay open
+
+        # The users are gone for this issue and every overlapping one
+        affected = {other for user in booked for other in user_slots.get(user.id, [])}
+        for other in sorted(affected, key=order.get):
+            if need[other] <= 0:
+                continue
+            other_start, other_end = intervals[other[0]]
+            if other[0] == issue_id or (other_start < end and start < other_end):
+                version[other] += 1
+                heapq.heappush(heap, (priority(other, feasible(other)), version[other], other))
+
     return assignment
 
 
@@ -0,0 +1,92 @@
+import numpy as np
+
+# Eligibility is computed for this many slots at a time, which bounds the
+# users x slots temporaries to a few MB per block on large installs.
+SLOT_BLOCK = 2048
+
+
+def to_epoch(datetimes):
+    """Naive datetimes as an int64 array of microseconds since 1970-01-01."""
+    return np.array(datetimes, dtype="datetime64[us]").astype(np.int64)
+
+
+class ColumnarProblem:
+    """
+    Column-oriented copy of the issues and users of one run.
+
+    - issue_start / issue_end: int64 epoch arrays, one entry per issue
+    - slot_issue / slot_role / slot_pair: one entry per (issue, role) slot,
+      the issue position, the role code and the (role, category) column
+    - ratings: users x (role, category) matrix; issues without a category use
+      the user's best rating for the role, like User.rating()
+    - off_user / off_start / off_end: every user's merged off-days flattened
+      into interval arrays, grouped by user position
+
+    eligible_slots() then tests "qualified and no off-day overlap" for all
+    users x slots with broadcasting instead of per-pair Python calls.
+    """
+
+    def __init__(self, issues, users):
+        self.issues = issues
+        self.users = users
+        self.issue_start = to_epoch([issue.start_datetime for issue in issues])
+        self.issue_end = to_epoch([issue.end_datetime for issue in issues])
+
+        self.roles = {}  # role -> code
+        pairs = {}       # (role, category) -> column in ratings
+        self.slots = []  # (issue_id, role) per slot
+        slot_issue, slot_role, slot_pair = [], [], []
+        for pos, issue in enumerate(issues):
+            for req_role in issue.required_roles:
+                role = req_role.role
+                self.slots.append((issue.id, role))
+                slot_issue.append(pos)
+                slot_role.append(self.roles.setdefault(role, len(self.roles)))
+                slot_pair.append(pairs.setdefault((role, issue.category), len(pairs)))
+        self.slot_issue = np.array(slot_issue, dtype=np.int64)
+        self.slot_role = np.array(slot_role, dtype=np.int64)
+        self.slot_pair = np.array(slot_pair, dtype=np.int64)
+
+        self.ratings = np.zeros((len(users), len(pairs)), dtype=np.int64)
+        for u, user in enumerate(users):
+            for (role, category), column in pairs.items():
+                self.ratings[u, column] = user.rating(role, category)
+
+        off_user, off_start, off_end = [], [], []
+        for u, user in enumerate(users):
+            off_user.extend([u] * len(user._off_starts))
+            off_start.extend(user._off_starts)
+            off_end.extend(user._off_ends)
+        self.off_user = np.array(off_user, dtype=np.int64)
+        self.off_start = to_epoch(off_start)
+        self.off_end = to_epoch(off_end)
+
+    def unavailable(self, issue_positions):
+        """
+        users x len(issue_positions) boolean matrix: True where one of the
+        user's off-days touches the issue window (both ends inclusive, as in
+        OffDay.conflicts_with).
+        """
+        result = np.zeros((len(self.users), len(issue_positions)), dtype=bool)
+        if len(self.off_user):
+            starts = self.issue_start[issue_positions]
+            ends = self.issue_end[issue_positions]
+            conflict = (self.off_start[:, None] <= ends[None, :]) & (starts[None, :] <= self.off_end[:, None])
+            # off_user is grouped, so OR-reduce each user's run of rows
+            users, first_rows = np.unique(self.off_user, return_index=True)
+            result[users] = np.logical_or.reduceat(conflict, first_rows, axis=0)
+        return result
+
+    def eligible_slots(self):
+        """
+        Yield (slot, user_positions, ratings) for every slot: the users that
+        are qualified (rating > 0) and have no off-day conflict, in user order.
+        """
+        for lo in range(0, len(self.slots), SLOT_BLOCK):
+            hi = min(lo + SLOT_BLOCK, len(self.slots))
+            issue_pos, inverse = np.unique(self.slot_issue[lo:hi], return_inverse=True)
+            ratings = self.ratings[:, self.slot_pair[lo:hi]]
+            eligible = (ratings > 0) & ~self.unavailable(issue_pos)[:, inverse]
+            for k in range(hi - lo):
+                user_positions = np.flatnonzero(eligible[:, k])
+                yield lo + k, user_positions, ratings[user_positions, k]
@@ -1,13 +1,17 @@
-from filter_eval import evaluate_filter_block
+from eligibility import EligibilityIndex
 
 
-def diagnose(issues, users):
+def diagnose(issues, users, index=None):
     """
     Diagnose potential infeasibility in the current issue-user assignments.
     :param issues:
     :param users:
+    :param index: EligibilityIndex for issues/users, built here if not given
     :return: log of diagnostics
     """
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
     print("🔍 Diagnosing infeasibility...\n")
 
     # 1) Local check: For each issue, see how many matching users each role has
@@ -16,28 +20,7 @@ def diagnose(issues, users):
             role = role_req.role
             needed = role_req.required_count
 
-            matching_users = []
-            for user in users:
-                # Check qualifications
-                if not any(q.role == role and (issue.category is None or q.category == issue.category)
-                           for q in user.qualifications):
-                    continue
-
-                # Check availability
-                if not user.is_available(issue.start_datetime, issue.end_datetime):
-                    continue
-
-                # Check custom filters
-                context = {
-                    "category": issue.category,
-                    "start_time": issue.start_datetime,
-                    "end_time": issue.end_datetime,
-                    "assigned_users": []
-                }
-                if any(not evaluate_filter_block(cf.conditions, context) for cf in user.custom_filters):
-                    continue
-
-                matching_users.append(user)
+            matching_users = find_candidates(users, issue, role, index)
 
             print(f"Issue {issue.id} '{issue.subject}' | Role '{role}' → Needed: {needed}, Available: {len(matching_users)}")
             # You could uncomment to see details:
@@ -46,7 +29,7 @@ def diagnose(issues, users):
 
     # 2) Global check: Pairwise overlap conflict
     # For any pair of overlapping issues, see if there's enough distinct users to fill *all* roles
-    conflicts = detect_pairwise_conflicts(issues, users)
+    conflicts = detect_pairwise_conflicts(issues, users, index)
     if conflicts:
         print("\n🔎 Potential Overlap Conflicts:")
         for c in conflicts:
@@ -54,11 +37,14 @@ def diagnose(issues, users):
     else:
         print("\nNo direct overlap conflict found via pairwise check. Possibly a more complex chain overlap, or ILP constraints are stricter.")
 
-def detect_pairwise_conflicts(issues, users):
+def detect_pairwise_conflicts(issues, users, index=None):
     """
     For each pair of issues that overlap in time, see if the sum of all roles needed
     can be filled by enough *distinct* users. If not, it's a global conflict.
     """
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
     conflicts = []
     # Sort issues by start time for easier reading
     sorted_issues = sorted(issues, key=lambda i: i.start_datetime)
@@ -80,7 +66,7 @@ def detect_pairwise_conflicts(issues, users):
                         "issue_id": issue.id,
                         "role_name": r_req.role,
                         "count": r_req.required_count,
-                        "candidates": find_candidates(users, issue, r_req.role)
+                        "candidates": find_candidates(users, issue, r_req.role, index)
                     })
 
             total_needed = sum(slot["count"] for slot in needed_slots)
@@ -102,18 +88,7 @@ def times_overlap(s1, e1, s2, e2):
     return (s1 < e2) and (s2 < e1)
 
 # Helper to find the list of candidate users for a single role in a single issue
-def find_candidates(users, issue, role):
-    cands = []
-    for user in users:
-        if any(q.role == role and (issue.category is None or q.category == issue.category)
-               for q in user.qualifications):
-            if user.is_available(issue.start_datetime, issue.end_datetime):
-                ctx = {
-                    "category": issue.category,
-                    "start_time": issue.start_datetime,
-                    "end_time": issue.end_datetime,
-                    "assigned_users": []
-                }
-                if not any(not evaluate_filter_block(cf.conditions, ctx) for cf in user.custom_filters):
-                    cands.append(user)
-    return cands
+def find_candidates(users, issue, role, index=None):
+    if index is None:
+        index = EligibilityIndex([issue], users)
+    return [user for user, _, _ in index.candidates(issue.id, role, include_filtered=False)]
@@ -0,0 +1,164 @@
+from columnar import ColumnarProblem
+from filter_eval import FilterColumns, FilterMemo
+
+
+def get_rating(user, role, category):
+    """Return the user's rating for (role, category), or 0 if unqualified."""
+    return user.rating(role, category)
+
+
+def issue_context(issue):
+    """Build the context custom filters are evaluated against for one issue."""
+    return {
+        "category": issue.category,
+        "start_time": issue.start_datetime,
+        "end_time": issue.end_datetime,
+        "assigned_users": [],
+        "name": issue.subject,
+    }
+
+
+class EligibilityIndex:
+    """
+    Who can fill which (issue, role) slot, computed once per run.
+
+    For every slot the index holds the users that are qualified (rating > 0)
+    and available (no off-day conflict), their rating, and whether they fail
+    any of their custom filters. Strategies decide themselves whether a filter
+    violation is a hard exclusion or a soft penalty.
+    """
+
+    def __init__(self, issues, users):
+        self.issues = issues
+        self.users = users
+        self.users_by_id = {u.id: u for u in users}
+        self._candidates = {}  # (issue_id, role) -> [(user, rating, fails_filter)]
+        self._ranked = {}      # (issue_id, role) -> candidates sorted by rating, best first
+        self._forward = {}     # (issue_id, role) -> [forward-assigned user ids]
+        self._entries = {}     # (issue_id, user_id, role) -> (rating, fails_filter)
+
+        self._categories = {issue.id: issue.category for issue in issues}
+        for issue in issues:
+            for req_role in issue.required_roles:
+                self._forward[(issue.id, req_role.role)] = [u.id for u in req_role.assigned_users]
+
+        # Qualification and off-day checks for all users x slots at once;
+        # filters are evaluated afterwards, only for the pairs that passed.
+        problem = ColumnarProblem(issues, users)
+        entries = self._entries
+        memo = self.filter_memo = FilterMemo()
+        contexts = [issue_context(issue) for issue in issues] if any(u.custom_filters for u in users) else []
+        columns = FilterColumns(contexts)
+        # Distinct filter -> mask over all issues from one batch call, None if it has to go issue by issue.
+        # Identical filters of different users share their CompiledFilter, so each is evaluated once.
+        masks = {}
+
+        def passes(cf, pos):
+            compiled = cf.compiled
+            if compiled not in masks:
+                masks[compiled] = compiled.batch(columns) if compiled.batch is not None else None
+            mask = masks[compiled]
+            if mask is not None:
+                return bool(mask[pos])
+            return memo.matches(compiled, contexts[pos])
+
+        fails = {}  # (issue position, user position) -> bool; filters do not depend on the role
+        for slot, user_positions, ratings in problem.eligible_slots():
+            issue_id, role = problem.slots[slot]
+            pos = int(problem.slot_issue[slot])
+            candidates = []
+            for u, rating in zip(user_positions.tolist(), ratings.tolist()):
+                user = users[u]
+                fails_filter = False
+                if user.custom_filters:
+                    key = (pos, u)
+                    if key not in fails:
+                        fails[key] = any(not passes(cf, pos) for cf in user.custom_filters)
+                    fails_filter = fails[key]
+                candidates.append((user, rating, fails_filter))
+                entries[(issue_id, user.id, role)] = (rating, fails_filter)
+            self._candidates[(issue_id, role)] = candidates
+
+        batched = sum(mask is not None for mask in masks.values())
+        if masks:
+            print(f"🧮 Custom filters: {batched} of {len(masks)} distinct evaluated in batch, "
+                  f"{memo.misses} single evaluations, {memo.hits} answered from the memo")
+
+    def subset(self, issues):
+        """
+        Index restricted to `issues` and to the users that are candidates or
+        forward-assigned there, sharing the already computed entries.
+        """
+        sub = EligibilityIndex.__new__(EligibilityIndex)
+        sub.issues = issues
+        sub._categories = {issue.id: issue.category for issue in issues}
+        sub._candidates = {}
+        sub._ranked = {}
+        sub._forward = {}
+        sub._entries = {}
+        sub.filter_memo = self.filter_memo
+
+        involved = set()
+        for issue in issues:
+            for req_role in issue.required_roles:
+                slot = (issue.id, req_role.role)
+                sub._candidates[slot] = self._candidates.get(slot, [])
+                sub._forward[slot] = self._forward.get(slot, [])
+                involved.update(sub._forward[slot])
+                for user, rating, fails_filter in sub._candidates[slot]:
+                    sub._entries[(issue.id, user.id, req_role.role)] = (rating, fails_filter)
+                    involved.add(user.id)
+
+        sub.users = [u for u in self.users if u.id in involved]
+        sub.users_by_id = {u.id: u for u in sub.users}
+        return sub
+
+    def candidates(self, issue_id, role, include_filtered=True):
+        """
+        Qualified and available users for a slot as (user, rating, fails_filter)
+        tuples, in the order of the user list. With include_filtered=False users
+        failing one of their custom filters are left out.
+        """
+        candidates = self._candidates.get((issue_id, role), [])
+        if include_filtered:
+            return candidates
+        return [c for c in candidates if not c[2]]
+
+    def ranked(self, issue_id, role):
+        """Same as candidates(), sorted by rating (best first, stable)."""
+        slot = (issue_id, role)
+        if slot not in self._ranked:
+            self._ranked[slot] = sorted(self._candidates.get(slot, []), key=lambda c: c[1], reverse=True)
+        return self._ranked[slot]
+
+    def forward_assigned(self, issue_id, role):
+        """Ids of users assigned to the slot upfront in Redmine."""
+        return self._forward.get((issue_id, role), [])
+
+    def is_candidate(self, issue_id, user_id, role):
+        return (issue_id, user_id, role) in self._entries
+
+    def rating(self, issue_id, user_id, role):
+        """Rating of a candidate for the slot, 0 if the user is not a candidate."""
+        entry = self._entries.get((issue_id, user_id, role))
+        return entry[0] if entry else 0
+
+    def fails_filter(self, issue_id, user_id, role):
+        entry = self._entries.get((issue_id, user_id, role))
+        return entry[1] if entry else False
+
+    def total_rating(self, assignment):
+        """
+        Sum of ratings over an assignment dict ({issue_id: {role: [user_ids]}}),
+        the quantity every strategy maximises. Forward-assigned users count with
+        their qualification rating even if they are not candidates.
+        """
+        total = 0
+        for issue_id, roles in assignment.items():
+            for role, user_ids in roles.items():
+                for user_id in user_ids:
+                    rating = self.rating(issue_id, user_id, role)
+                    if not rating and user_id in self.users_by_id:
+                        rating = get_rating(self.users_by_id[user_id], role, self._categories.get(issue_id))
+                    total += rating
+        return total
@@ -1,5 +1,11 @@
 import datetime
-from typing import Any, Dict
+import json
+import operator
+import threading
+import weakref
+from collections import OrderedDict
+import numpy as np
+from typing import Any, Callable, Dict, Optional, Tuple
 
 VALID_OPERATORS = ["==", "!=", ">", "<", ">=", "<=", "in", "not in"]
 VALID_VARIABLES = ["category", "start_time", "end_time", "assigned_users", "name"]
@@ -106,4 +112,436 @@ def parse_time_literal(value: Any) -> Any:
         parts = value.split(":")
         if len(parts) == 2 and all(p.isdigit() for p in parts):
             return datetime.time(int(parts[0]), int(parts[1]))
-    return value
\ No newline at end of file
+    return value
+
+_COMPARISONS = {
+    "==": operator.eq,
+    "!=": operator.ne,
+    ">": operator.gt,
+    "<": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+    "in": lambda left, right: left in right,
+    "not in": lambda left, right: left not in right,
+}
+
+
+def compile_filter(block: Dict[str, Any]) -> Callable[[Dict[str, Any]], bool]:
+    """
+    Turn a filter block into a closure with the same result as
+    evaluate_filter_block(block, context). The tree is walked, operators are
+    validated and time literals are parsed once, here, instead of on every
+    evaluation. A malformed part compiles to the interpreter itself, so it
+    raises the same error at the same moment (e.g. not at all when an 'or'
+    short-circuits before reaching it).
+    """
+    try:
+        return _compile_block(block)
+    except Exception:
+        return lambda context: evaluate_filter_block(block, context)
+
+
+def _compile_block(block):
+    if "rules" in block and "conditions" in block:
+        return _compile_all([compile_filter(block["rules"]), compile_filter(block["conditions"])])
+    if "rules" in block:
+        return compile_filter(block["rules"])
+    if "conditions" in block:
+        return compile_filter(block["conditions"])
+    if "and" in block:
+        return _compile_all([compile_filter(sub) for sub in block["and"]])
+    if "or" in block:
+        parts = [compile_filter(sub) for sub in block["or"]]
+        return lambda context: any(part(context) for part in parts)
+    return _compile_operator(block)
+
+
+def _compile_all(parts):
+    return lambda context: all(part(context) for part in parts)
+
+
+def _compile_operator(operator_block):
+    if len(operator_block) != 1:
+        raise ValueError(f"Malformed operator block: {operator_block}")
+    op = next(iter(operator_block))
+    if op not in VALID_OPERATORS:
+        raise ValueError(f"Unsupported operator '{op}'. Must be one of {VALID_OPERATORS}.")
+    args = operator_block[op]
+    if not isinstance(args, list) or len(args) != 2:
+        raise ValueError(f"Operator '{op}' requires exactly two arguments, got: {args}")
+
+    compare = _COMPARISONS[op]
+    left_raw, right_raw = args
+    left_var = left_raw["var"] if isinstance(left_raw, dict) and "var" in left_raw else None
+    right_var = right_raw["var"] if isinstance(right_raw, dict) and "var" in right_raw else None
+
+    # Literals get the same conversions evaluate_operator applies, ahead of time
+    if left_var is None:
+        left = parse_time_literal(left_raw)
+        if isinstance(left, datetime.datetime):
+            left = left.time()
+    if right_var is None:
+        right = parse_time_literal(parse_time_literal(right_raw))
+
+    if left_var is not None and right_var is not None:
+        def evaluate(context):
+            left_val = context.get(left_var, None)
+            if isinstance(left_val, datetime.datetime):
+                left_val = left_val.time()
+            right_val = context.get(right_var, None)
+            if isinstance(right_val, str):
+                right_val = parse_time_literal(right_val)
+            return compare(left_val, right_val)
+    elif left_var is not None:
+        def evaluate(context):
+            left_val = context.get(left_var, None)
+            if isinstance(left_val, datetime.datetime):
+                left_val = left_val.time()
+            return compare(left_val, right)
+    elif right_var is not None:
+        def evaluate(context):
+            right_val = context.get(right_var, None)
+            if isinstance(right_val, str):
+                right_val = parse_time_literal(right_val)
+            return compare(left, right_val)
+    else:
+        def evaluate(context):
+            return compare(left, right)
+    return evaluate
+
+
+def filter_variables(block: Dict[str, Any]) -> Optional[Tuple[Tuple[str, bool], ...]]:
+    """
+    The context variables a filter reads, as sorted (name, time_only) pairs.
+    time_only is True when the variable only ever appears on the left of an
+    operator, where a datetime is reduced to its time of day, so two contexts
+    whose datetimes differ only in the date give the same result.
+    Returns None for blocks compile_filter cannot analyse (they raise anyway).
+    """
+    variables = {}
+    try:
+        _collect_variables(block, variables)
+    except Exception:
+        return None
+    return tuple(sorted(variables.items()))
+
+
+def _collect_variables(block, variables):
+    if "rules" in block or "conditions" in block:
+        for key in ("rules", "conditions"):
+            if key in block:
+                _collect_variables(block[key], variables)
+        return
+    for key in ("and", "or"):
+        if key in block:
+            for sub in block[key]:
+                _collect_variables(sub, variables)
+            return
+
+    # Same shape checks as _compile_operator
+    if len(block) != 1:
+        raise ValueError(f"Malformed operator block: {block}")
+    op = next(iter(block))
+    args = block[op]
+    if op not in VALID_OPERATORS or not isinstance(args, list) or len(args) != 2:
+        raise ValueError(f"Malformed operator block: {block}")
+    for raw, time_only in zip(args, (True, False)):
+        if isinstance(raw, dict) and "var" in raw:
+            name = raw["var"]
+            variables[name] = variables.get(name, True) and time_only
+
+
+_MISSING = object()
+
+
+class FilterMemo:
+    """
+    Filter results memoised on (filter, projection of the context onto the
+    variables it reads). The filter is a CompiledFilter, or anything else
+    with .variables and .matches such as a CustomFilter. Issues sharing a
+    category and time of day, e.g. a weekly show, are then evaluated once
+    per filter.
+    """
+
+    def __init__(self):
+        self._results = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __reduce__(self):
+        # Keys hold compiled filters (closures); a worker process starts with an empty memo
+        return FilterMemo, ()
+
+    def matches(self, custom_filter, context: Dict[str, Any]) -> bool:
+        variables = custom_filter.variables
+        if variables is None:
+            return custom_filter.matches(context)
+        key = (custom_filter, tuple(_project(context.get(name, None), time_only) for name, time_only in variables))
+        try:
+            result = self._results.get(key, _MISSING)
+        except TypeError:
+            # An unhashable value in the context
+            return custom_filter.matches(context)
+        if result is _MISSING:
+            self.misses += 1
+            result = self._results[key] = custom_filter.matches(context)
+        else:
+            self.hits += 1
+        return result
+
+
+def _project(value, time_only):
+    if time_only and isinstance(value, datetime.datetime):
+        value = value.time()
+    elif isinstance(value, list):
+        return list, tuple(value)
+    # The type keeps e.g. 1, 1.0 and True apart
+    return type(value), value
+
+
+class FilterColumns:
+    """
+    The filter contexts of many issues as columns, for compile_batch().
+    Columns are built on first use and cached, already converted the way
+    evaluate_operator converts each side: datetimes on the left become times
+    of day, strings on the right go through parse_time_literal.
+    """
+
+    def __init__(self, contexts):
+        self.contexts = contexts
+        self.size = len(contexts)
+        self._columns = {}
+
+    def values(self, name, left):
+        key = (name, left)
+        if key not in self._columns:
+            column = np.empty(self.size, dtype=object)
+            for pos, context in enumerate(self.contexts):
+                value = context.get(name, None)
+                if left and isinstance(value, datetime.datetime):
+                    value = value.time()
+                elif not left and isinstance(value, str):
+                    value = parse_time_literal(value)
+                column[pos] = value
+            self._columns[key] = column
+        return self._columns[key]
+
+    def time_of_day(self, name):
+        """Microseconds since midnight if the variable is a datetime in every context, else None."""
+        key = (name, "time_of_day")
+        if key not in self._columns:
+            values = [context.get(name, None) for context in self.contexts]
+            column = None
+            if all(type(value) is datetime.datetime for value in values):
+                column = np.array([_time_micros(value.time()) for value in values], dtype=np.int64)
+            self._columns[key] = column
+        return self._columns[key]
+
+
+_ARRAY_COMPARISONS = {
+    "==": np.equal,
+    "!=": np.not_equal,
+    ">": np.greater,
+    "<": np.less,
+    ">=": np.greater_equal,
+    "<=": np.less_equal,
+}
+
+
+
+def _time_micros(value):
+    return ((value.hour * 60 + value.minute) * 60 + value.second) * 1000000 + value.microsecond
+
+
+def compile_batch(block: Dict[str, Any]) -> Optional[Callable[[FilterColumns], Optional[np.ndarray]]]:
+    """
+    Batch form of compile_filter: the returned function takes FilterColumns
+    for n issues and returns a boolean mask of length n, evaluating each
+    operator and each and/or node as one array operation. Times of day
+    compared against time literals use int64 arrays; other operands are
+    compared element-wise with the Python operators, so results match the
+    interpreter exactly.
+
+    Every branch is evaluated for every issue, so where the interpreter
+    would raise for some issue the batch function returns None instead and
+    the caller evaluates that filter issue by issue. Returns None up front
+    for blocks that cannot be compiled.
+    """
+    if filter_variables(block) is None:
+        return None
+    evaluate = _batch_block(block)
+
+    def run(columns):
+        try:
+            return np.broadcast_to(evaluate(columns), (columns.size,))
+        except Exception:
+            return None
+    return run
+
+
+def _batch_block(block):
+    if "rules" in block and "conditions" in block:
+        return _batch_reduce(np.logical_and, True, [_batch_block(block["rules"]), _batch_block(block["conditions"])])
+    if "rules" in block:
+        return _batch_block(block["rules"])
+    if "conditions" in block:
+        return _batch_block(block["conditions"])
+    if "and" in block:
+        return _batch_reduce(np.logical_and, True, [_batch_block(sub) for sub in block["and"]])
+    if "or" in block:
+        return _batch_reduce(np.logical_or, False, [_batch_block(sub) for sub in block["or"]])
+    return _batch_operator(block)
+
+
+def _batch_reduce(combine, empty, parts):
+    def evaluate(columns):
+        mask = np.full(columns.size, empty)
+        for part in parts:
+            mask = combine(mask, part(columns))
+        return mask
+    return evaluate
+
+
+def _batch_operator(operator_block):
+    op = next(iter(operator_block))
+    left_raw, right_raw = operator_block[op]
+    left_var = left_raw["var"] if isinstance(left_raw, dict) and "var" in left_raw else None
+    right_var = right_raw["var"] if isinstance(right_raw, dict) and "var" in right_raw else None
+
+    # Literals converted exactly as in _compile_operator
+    left = right = None
+    if left_var is None:
+        left = parse_time_literal(left_raw)
+        if isinstance(left, datetime.datetime):
+            left = left.time()
+    if right_var is None:
+        right = parse_time_literal(parse_time_literal(right_raw))
+
+    compare = _COMPARISONS[op]
+    array_compare = _ARRAY_COMPARISONS.get(op)
+
+    def evaluate(columns):
+        # Fast path: a time of day against a time literal, as integers
+        if array_compare is not None and left_var is not None and right_var is None \
+                and type(right) is datetime.time and right.tzinfo is None:
+            times = columns.time_of_day(left_var)
+            if times is not None:
+                return array_compare(times, _time_micros(right))
+
+        left_val = columns.values(left_var, True) if left_var is not None else _scalar(left)
+        right_val = columns.values(right_var, False) if right_var is not None else _scalar(right)
+        # Equality with a string literal is str.__eq__ for every element, done in NumPy's loop
+        if op in ("==", "!=") and ((right_var is None and type(right) is str)
+                                   or (left_var is None and type(left) is str)):
+            return np.asarray(array_compare(left_val, right_val), dtype=bool)
+        return np.asarray(np.frompyfunc(compare, 2, 1)(left_val, right_val)).astype(bool)
+    return evaluate
+
+
+def _scalar(value):
+    """A literal as a 0-d object array, so NumPy never unpacks lists or tuples."""
+    wrapped = np.empty((), dtype=object)
+    wrapped[()] = value
+    return wrapped
+
+
+class CompiledFilter:
+    """
+    Every compiled form of one filter's conditions. Users with identical
+    conditions share one instance (see intern_filter), so masks and memo
+    entries keyed on it are computed once per distinct filter.
+    """
+    __slots__ = ("key", "matches", "variables", "batch", "rules", "conditions", "__weakref__")
+
+    def __init__(self, conditions: Dict[str, Any], key: Optional[str] = None):
+        self.key = key
+        # matches(context) == evaluate_filter_block(conditions, context)
+        self.matches = compile_filter(conditions)
+        self.variables = filter_variables(conditions)  # what FilterMemo keys results on
+        self.batch = compile_batch(conditions)  # mask over FilterColumns of many issues, or None
+        # The two halves on their own, for CustomFilter.evaluate_for_issue
+        rules_block = conditions.get("rules")
+        conditions_block = conditions.get("conditions")
+        self.rules = compile_filter(rules_block) if rules_block else None
+        self.conditions = compile_filter(conditions_block) if conditions_block else None
+
+
+# Compiled filters kept across requests by FILTER_CACHE
+FILTER_CACHE_SIZE = 1024
+
+
+class FilterCache:
+    """
+    Process-wide LRU of CompiledFilters by canonical key, so filters re-sent
+    with every /run_algorithm call are compiled once per process. Filters
+    evicted from the LRU but still held by a loaded user are found through a
+    weak table and count as hits too. Safe to share between request threads.
+    """
+
+    def __init__(self, maxsize: int = FILTER_CACHE_SIZE):
+        self.maxsize = maxsize
+        # Lookups reorder and evict; the lock also keeps two threads from compiling the same filter
+        self._lock = threading.Lock()
+        self._lru = OrderedDict()
+        self._live = weakref.WeakValueDictionary()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._lru)
+
+    def get(self, key: str, conditions: Dict[str, Any]) -> "CompiledFilter":
+        with self._lock:
+            compiled = self._lru.get(key)
+            if compiled is not None:
+                self._lru.move_to_end(key)
+                self.hits += 1
+                return compiled
+
+            compiled = self._live.get(key)
+            if compiled is None:
+                self.misses += 1
+                compiled = self._live[key] = CompiledFilter(conditions, key)
+            else:
+                self.hits += 1
+            self._lru[key] = compiled
+            if len(self._lru) > self.maxsize:
+                self._lru.popitem(last=False)
+                self.evictions += 1
+            return compiled
+
+    def clear(self):
+        with self._lock:
+            self._lru.clear()
+            self._live = weakref.WeakValueDictionary()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._lru), "maxsize": self.maxsize, "hits": self.hits,
+                    "misses": self.misses, "evictions": self.evictions}
+
+
+FILTER_CACHE = FilterCache()
+
+
+def filter_key(conditions: Dict[str, Any]) -> Optional[str]:
+    """
+    Canonical JSON of a filter's conditions (sorted keys), or None if it
+    cannot be serialised. Non-JSON values are tagged with their type, so a
+    time literal never collides with the string "18:00:00".
+    """
+    try:
+        return json.dumps(conditions, sort_keys=True, separators=(",", ":"),
+                          default=lambda value: {"__type__": type(value).__name__, "repr": repr(value)})
+    except (TypeError, ValueError):
+        return None
+
+
+def intern_filter(conditions: Dict[str, Any]) -> CompiledFilter:
+    """The shared CompiledFilter for these conditions, compiling them on first sight."""
+    key = filter_key(conditions)
+    if key is None:
+        return CompiledFilter(conditions)
+    return FILTER_CACHE.get(key, conditions)
@@ -1,18 +1,38 @@
-from datetime import datetime
 import re
+import warnings
+from datetime import datetime
+from functools import lru_cache
+import numpy as np
+
+# Distinct timestamp strings remembered by parse_datetime. Redmine sends the
+# same issue and off-day bounds with every request.
+PARSE_CACHE_SIZE = 65536
+
+# The ISO shapes parse_epochs hands to NumPy once the offset is stripped. NumPy
+# also reads "now", "today" or "2025-01", which parse_datetime rejects.
+_BULK_ISO = re.compile(r"\d{4}-\d{2}-\d{2}(?:[T ]\d{2}:\d{2}(?::\d{2}(?:\.\d{1,6})?)?)?")
+
 
 def parse_datetime(dt_str: str):
     """
     Parse ISO datetime string and remove any timezone,
     ensuring we have a 'naive' datetime.
-    Return None if dt_str is None or empty.
+    Return None if dt_str is None or empty. Datetimes that are already
+    parsed (see parse_datetimes) are returned as they are, naive.
     """
     if not dt_str:
         return None
+    if isinstance(dt_str, datetime):
+        return dt_str.replace(tzinfo=None)
+    return _parse_iso(dt_str)
+
 
+@lru_cache(maxsize=PARSE_CACHE_SIZE)
+def _parse_iso(dt_str):
     # Python's fromisoformat() can't handle a trailing 'Z' in older versions,
-    # so let's do a quick fix: replace 'Z' with '+00:00'
-    dt_str = re.sub(r"Z$", "+00:00", dt_str)
+    # so turn it into '+00:00' (a plain character check, no regex)
+    if dt_str[-1] == "Z":
+        dt_str = dt_str[:-1] + "+00:00"
 
     try:
         dt = datetime.fromisoformat(dt_str)
@@ -24,3 +44,100 @@ def parse_datetime(dt_str: str):
         # if fromisoformat fails, you might use dateutil.parser
         # but let's keep it simple here:
         raise ValueError(f"Unable to parse datetime: {dt_str}")
+
+
+def _strip_offset(dt_str):
+    """Drop a trailing 'Z' or '+HH:MM'/'-HH:MM', keeping the wall-clock time like parse_datetime."""
+    if not dt_str:
+        return dt_str
+    if dt_str[-1] == "Z":
+        return dt_str[:-1]
+    if len(dt_str) > 19 and dt_str[-6] in "+-" and dt_str[-3] == ":":
+        return dt_str[:-6]
+    return dt_str
+
+
+def parse_epochs(dt_strs):
+    """
+    Bulk parse_datetime for a list of ISO strings, returned as an int64 array
+    of microseconds since 1970-01-01 (the columnar time representation).
+    NumPy parses the common forms in one call; if any string has another
+    shape or is outside what NumPy understands, every string goes through
+    parse_datetime instead. None and empty strings become NaT (the minimum int64).
+    """
+    stripped = [_strip_offset(s) for s in dt_strs]
+    if not all(_BULK_ISO.fullmatch(s) for s in set(stripped) if s):
+        return np.array([parse_datetime(s) for s in dt_strs], dtype="datetime64[us]").astype(np.int64)
+    try:
+        with warnings.catch_warnings():
+            # NumPy only warns about offsets it would convert to UTC
+            warnings.simplefilter("error")
+            return np.array(stripped, dtype="datetime64[us]").astype(np.int64)
+    except (ValueError, UserWarning, DeprecationWarning):
+        return np.array([parse_datetime(s) for s in dt_strs], dtype="datetime64[us]").astype(np.int64)
+
+
+def parse_datetimes(dt_strs):
+    """
+    parse_datetime for a whole list at once: naive datetimes, None where the
+    string is None or empty. The non-empty strings go through parse_epochs in
+    one call.
+    """
+    positions = [pos for pos, s in enumerate(dt_strs) if s]
+    result = [None] * len(dt_strs)
+    if positions:
+        epochs = parse_epochs([dt_strs[pos] for pos in positions])
+        for pos, dt in zip(positions, epochs.astype("datetime64[us]").tolist()):
+            result[pos] = dt
+    return result
+
+
+def overlap_cliques(intervals):
+    """
+    Find the maximal cliques of the interval graph spanned by `intervals`.
+
+    `intervals` is an iterable of (key, start, end) tuples. Two intervals
+    conflict when they overlap strictly (s1 < e2 and s2 < e1), so intervals
+    that only touch at an endpoint do not conflict. Every conflicting pair
+    shares at least one of the returned cliques, which makes one constraint
+    per clique equivalent to one constraint per overlapping pair.
+
+    Returns a list of key lists, each with at least two keys.
+    """
+    proper = []
+    degenerate = []
+    for key, start, end in intervals:
+        if start < end:
+            proper.append((key, start, end))
+        else:
+            degenerate.append((key, start, end))
+
+    # Sweep over start/end events; at equal times ends go first so that
+    # touching intervals are not treated as overlapping.
+    events = []
+    for pos, (key, start, end) in enumerate(proper):
+        events.append((start, 1, pos))
+        events.append((end, 0, pos))
+    events.sort()
+
+    cliques = []
+    active = {}
+    grew = False
+    for _, is_start, pos in events:
+        if is_start:
+            active[pos] = proper[pos][0]
+            grew = True
+        else:
+            if grew and len(active) > 1:
+                cliques.append(list(active.values()))
+            grew = False
+            del active[pos]
+
+    # Zero-length (or inverted) intervals never overlap each other; each one
+    # forms a single clique with the proper intervals that overlap it.
+    for key, start, end in degenerate:
+        members = [p_key for p_key, p_start, p_end in proper if start < p_end and p_start < end]
+        if members:
+            cliques.append([key] + members)
+
+    return cliques
@@ -1,7 +1,9 @@
 from flask import Flask, request, jsonify
 import requests
 from models import initialize_data
+from eligibility import EligibilityIndex
 from process import match_issues_to_users
+from filter_eval import FILTER_CACHE
 import io
 import sys
 
@@ -37,6 +39,13 @@ def run_algorithm():
         print()
         allow_partial = request.json.get("partial_solution", False)
         print(f"ℹ️ Partial solution allowed: {allow_partial}")
+        warm_start = request.json.get("warm_start", False)
+        print(f"ℹ️ Greedy warm start: {warm_start}")
+        time_limit = request.json.get("time_limit")
+        gap_rel = request.json.get("gap_rel")
+        print(f"ℹ️ Solver time limit: {time_limit} s, relative gap: {gap_rel}")
+        strategy = request.json.get("strategy", "ilp")
+        print(f"ℹ️ Strategy: {strategy}")
         
         # Get data directly from the POST request
         json_data = request.json.get("data")
@@ -47,6 +56,9 @@ def run_algorithm():
         print("✅ Data received successfully!\n")
 
         issues, users = initialize_data(json_data)
+        cache = FILTER_CACHE.stats()
+        print(f"🗂️ Compiled filter cache: {cache['size']}/{cache['maxsize']} entries, "
+              f"{cache['hits']} hits, {cache['misses']} misses, {cache['evictions']} evictions")
 
         print("📌 Issues Loaded:")
         for issue in issues:
@@ -56,8 +68,11 @@ def run_algorithm():
         for user in users:
             print(str(user))
 
+        index = EligibilityIndex(issues, users)
+
         print("\n🔄 Running Matching Algorithm with Datetime Checks...")
-        results = match_issues_to_users(issues, users, allow_partial)
+        results = match_issues_to_users(issues, users, allow_partial, strategy=strategy, index=index,
+                                        warm_start=warm_start, time_limit=time_limit, gap_rel=gap_rel)
 
         print("\n=== FINAL RESULTS ===")
         for issue_id, role_assignments in results.items():
@@ -72,7 +87,8 @@ def run_algorithm():
 
         return jsonify({
             "status": "success",
-            "output": mystdout.getvalue()
+            "output": mystdout.getvalue(),
+            "filter_cache": FILTER_CACHE.stats()
         }), 200
 
     except Exception as e:
@@ -82,5 +98,10 @@ def run_algorithm():
             "output": mystdout.getvalue() + f"\n❌ Exception occurred: {str(e)}"
         }), 500
 
+@app.route("/filter_cache", methods=["GET"])
+def filter_cache_stats():
+    """Hit/miss statistics of the process-wide compiled-filter cache."""
+    return jsonify(FILTER_CACHE.stats()), 200
+
 if __name__ == "__main__":
     app.run(host="0.0.0.0", port=5000)
\ No newline at end of file
@@ -1,12 +1,22 @@
+import sys
+from bisect import bisect_left
 from datetime import datetime, timedelta
-from typing import List, Dict, Any
-from helper import parse_datetime
-from filter_eval import evaluate_filter_block
+from typing import List, Dict, Any, Optional
+from helper import parse_datetime, parse_datetimes
+from filter_eval import intern_filter
+
+
+def _intern(value):
+    """Role and category names repeat across every user and issue; share one string object each."""
+    return sys.intern(value) if isinstance(value, str) else value
+
 
 class Qualification:
+    __slots__ = ("role", "category", "rating")
+
     def __init__(self, role: str, category: str, rating: int):
-        self.role = role
-        self.category = category
+        self.role = _intern(role)
+        self.category = _intern(category)
         self.rating = rating
 
     def __repr__(self):
@@ -14,6 +24,8 @@ class Qualification:
 
 
 class OffDay:
+    __slots__ = ("start_datetime", "end_datetime")
+
     def __init__(self, start_datetime: str, end_datetime: str):
         self.start_datetime = parse_datetime(start_datetime)
         self.end_datetime = parse_datetime(end_datetime)
@@ -28,9 +40,29 @@ class OffDay:
 
 
 class CustomFilter:
+    __slots__ = ("name", "conditions", "compiled")
+
     def __init__(self, name: str, conditions: Dict[str, Any]):
         self.name = name
         self.conditions = conditions  # e.g. { "rules": {...}, "conditions": {...} }
+        # Shared by every user whose filter has the same conditions
+        self.compiled = intern_filter(conditions)
+
+    @property
+    def matches(self):
+        return self.compiled.matches
+
+    @property
+    def variables(self):
+        return self.compiled.variables
+
+    @property
+    def batch(self):
+        return self.compiled.batch
+
+    def __reduce__(self):
+        # The compiled closures cannot be pickled; rebuild (and re-intern) them on load
+        return CustomFilter, (self.name, self.conditions)
 
     def __repr__(self):
         return f"<Filter: {self.name}>"
@@ -44,20 +76,41 @@ class CustomFilter:
             "name": issue.subject,
         }
 
-        rules_block = self.conditions.get("rules")
         rules_result = True
-        if rules_block:
-            rules_result = evaluate_filter_block(rules_block, context)
+        if self.compiled.rules:
+            rules_result = self.compiled.rules(context)
 
-        conditions_block = self.conditions.get("conditions")
         conditions_result = True
-        if conditions_block:
-            conditions_result = evaluate_filter_block(conditions_block, context)
+        if self.compiled.conditions:
+            conditions_result = self.compiled.conditions(context)
 
         return rules_result and conditions_result
 
 
+def _merge_off_days(off_days):
+    """
+    Coalesce off-days into sorted, disjoint [start, end] intervals, returned
+    as parallel start and end lists. Off-days that touch are merged too, since
+    conflicts_with treats both ends as inclusive.
+    """
+    intervals = sorted((od.start_datetime, od.end_datetime) for od in off_days
+                       if od.start_datetime is not None and od.end_datetime is not None
+                       and od.start_datetime <= od.end_datetime)
+    starts, ends = [], []
+    for start, end in intervals:
+        if ends and start <= ends[-1]:
+            if end > ends[-1]:
+                ends[-1] = end
+        else:
+            starts.append(start)
+            ends.append(end)
+    return starts, ends
+
+
 class User:
+    __slots__ = ("id", "login", "firstname", "lastname", "qualifications", "off_days", "custom_filters",
+                 "_ratings", "_best_ratings", "_off_starts", "_off_ends")
+
     def __init__(self, user_data: Dict):
         self.id = user_data["id"]
         self.login = user_data.get("login", "")
@@ -67,43 +120,81 @@ class User:
             Qualification(**q) for q in user_data.get("qualifications", [])
         ]
         self.off_days = [OffDay(**od) for od in user_data.get("off_days", [])]
+        self._off_starts, self._off_ends = _merge_off_days(self.off_days)
         self.custom_filters = [CustomFilter(**cf) for cf in user_data.get("custom_filters", [])]
 
+        # (role, category) -> rating, plus role -> best rating for issues without a category.
+        # The first qualification listed for a (role, category) pair wins, as in the old scan.
+        self._ratings = {}
+        self._best_ratings = {}
+        for q in self.qualifications:
+            self._ratings.setdefault((q.role, q.category), q.rating)
+            if q.rating > self._best_ratings.get(q.role, 0):
+                self._best_ratings[q.role] = q.rating
 
     def __repr__(self):
         return f"User: {self.firstname} {self.lastname} ({self.login})"
 
-    def is_available(self, start: datetime, end: datetime) -> bool:
-        for off_day in self.off_days:
-            if off_day.conflicts_with(start, end):
-                return False
-        return True
+    def is_available(self, start: datetime, end: Optional[datetime]) -> bool:
+        """
+        No off-day touches [start, end] (or the instant `start` if end is None).
+        The merged off-days are disjoint and sorted, so the first one ending at
+        or after `start` is the only candidate for a conflict.
+        """
+        pos = bisect_left(self._off_ends, start)
+        return pos == len(self._off_starts) or self._off_starts[pos] > (start if end is None else end)
+
+    def rating(self, role: str, category: Optional[str] = None) -> int:
+        """Rating for the role in the category (best over all categories if None), 0 if unqualified."""
+        if category is None:
+            return self._best_ratings.get(role, 0)
+        return self._ratings.get((role, category), 0)
 
     def get_role_rating(self, role: str, category: str) -> int:
-        for qualification in self.qualifications:
-            if qualification.role == role and qualification.category == category:
-                return qualification.rating
-        return 0
+        return self._ratings.get((role, category), 0)
+
+
 
+class AssignedUser:
+    """
+    A user already assigned to an issue, as sent with the issue. Only the
+    identity is needed (the solvers read .id, custom filters read .firstname),
+    so no qualifications, off-days or filters are built for it.
+    """
+    __slots__ = ("id", "login", "firstname", "lastname")
+
+    def __init__(self, user_data: Dict):
+        self.id = user_data["id"]
+        self.login = user_data.get("login", "")
+        self.firstname = user_data.get("firstname", "")
+        self.lastname = user_data.get("lastname", "")
+
+    def __repr__(self):
+        return f"AssignedUser: {self.firstname} {self.lastname} ({self.id})"
 
 
 class RequiredRole:
+    __slots__ = ("role", "required_count", "assigned_users")
+
     def __init__(self, role: str, required_count: int, assigned_users: List[Dict]):
-        self.role = role
+        self.role = _intern(role)
         self.required_count = required_count
-        self.assigned_users = [User(u) for u in assigned_users]
+        self.assigned_users = [AssignedUser(u) for u in assigned_users]
 
     def __repr__(self):
         return f"<RequiredRole: {self.role} needs {self.required_count}, assigned: {len(self.assigned_users)}>"
 
 
 class Issue:
+    __slots__ = ("id", "subject", "category", "category_priority", "priority",
+                 "start_datetime", "end_datetime", "required_roles")
+
     def __init__(self, issue_data):
         self.id = issue_data["id"]
         self.subject = issue_data["subject"]
-        self.category = issue_data["category"]
+        self.category = _intern(issue_data["category"])
         self.category_priority = issue_data["category_priority"]
-        self.priority = issue_data["priority"]
+        self.priority = _intern(issue_data["priority"])
         self.start_datetime = parse_datetime(issue_data["start_datetime"])
         if self.start_datetime is None:
             raise ValueError("start_datetime is required and could not be parsed.")
@@ -122,6 +213,27 @@ class Issue:
 
 
 def initialize_data(json_data):
-    issues = [Issue(i) for i in json_data["issues"]]
-    users = [User(u) for u in json_data["users"]]
+    issues_data = json_data["issues"]
+    users_data = json_data["users"]
+
+    # 🚀 Parse every timestamp of the request in one bulk call, then hand the
+    # constructors datetimes (copies of the dicts, the request stays untouched)
+    off_days = [od for u in users_data for od in u.get("off_days", [])]
+    raw = ([i["start_datetime"] for i in issues_data] + [i.get("end_datetime") for i in issues_data]
+           + [od["start_datetime"] for od in off_days] + [od["end_datetime"] for od in off_days])
+    parsed = parse_datetimes(raw)
+    n, m = len(issues_data), len(off_days)
+    starts, ends = parsed[:n], parsed[n:2 * n]
+    off_starts, off_ends = parsed[2 * n:2 * n + m], parsed[2 * n + m:]
+
+    issues = [Issue(dict(i, start_datetime=start, end_datetime=end))
+              for i, start, end in zip(issues_data, starts, ends)]
+
+    parsed_off_days = iter([dict(od, start_datetime=start, end_datetime=end)
+                            for od, start, end in zip(off_days, off_starts, off_ends)])
+    users = []
+    for u in users_data:
+        if "off_days" in u:
+            u = dict(u, off_days=[next(parsed_off_days) for _ in u["off_days"]])
+        users.append(User(u))
     return issues, users
@@ -1,14 +1,40 @@
 from datetime import datetime
 from models import User, Issue
+from eligibility import EligibilityIndex
 import  algo_ILP, algo_greedy, algo_backtracking
 
-def match_issues_to_users(issues, users, allow_partial=False, strategy="ilp"):
+# ILP strategies and the solver backend they use (see solvers.SOLVER_BACKENDS)
+ILP_SOLVERS = {"ilp": "cbc", "ilp-cbc": "cbc", "ilp-highs": "highs"}
+HEURISTIC_STRATEGIES = ("greedy", "greedy_ls", "greedy_regret", "backtracking_basic", "backtracking_exact")
+STRATEGIES = tuple(ILP_SOLVERS) + HEURISTIC_STRATEGIES
+
+def match_issues_to_users(issues, users, allow_partial=False, strategy="ilp", index=None,
+                          warm_start=False, stats=None, time_limit=None, gap_rel=None):
+    if strategy not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{strategy}', expected one of {sorted(STRATEGIES)}")
+
+    # Eligibility is computed once per run and shared by the strategy and its fallbacks
+    if index is None:
+        index = EligibilityIndex(issues, users)
+
     if strategy == "greedy":
-        return algo_greedy.greedy(issues, users)
+        return algo_greedy.greedy(issues, users, index)
+    elif strategy == "greedy_ls":
+        # Greedy refined by local search: the fast preview mode, bounded by time_limit
+        improve_seconds = time_limit if time_limit is not None else algo_greedy.DEFAULT_IMPROVE_SECONDS
+        return algo_greedy.greedy(issues, users, index, improve_seconds=improve_seconds)
+    elif strategy == "greedy_regret":
+        return algo_greedy.greedy_regret(issues, users, index)
     elif strategy == "backtracking_basic":
-        return algo_backtracking.backtracking_basic(issues, users)
+        return algo_backtracking.backtracking_basic(issues, users, index, stats=stats, time_limit=time_limit)
+    elif strategy == "backtracking_exact":
+        return algo_backtracking.backtracking_basic(issues, users, index, stats=stats, time_limit=time_limit,
+                                                    exhaustive=True)
     else:
-        return algo_ILP.ilp(issues, users, allow_partial,filter_penalty=0)
+        solver = ILP_SOLVERS[strategy]
+        return algo_ILP.ilp(issues, users, allow_partial,filter_penalty=0, index=index,
+                            warm_start=warm_start, stats=stats, time_limit=time_limit, gap_rel=gap_rel,
+                            solver=solver)
 
 def is_qualified_for_role(user, role, category):
     for q in user.qualifications:
@@ -0,0 +1,68 @@
+from bisect import bisect_left, bisect_right
+
+
+class IntervalSchedule:
+    """
+    Busy intervals of one user, kept sorted by start time together with the
+    running maximum of their end times.
+
+    An overlap query is two bisects: every interval starting before the query
+    ends sits left of bisect_left(starts, end), and one of them overlaps iff
+    the largest end among them lies after the query start. Intervals are
+    usually added in start order, which makes add() an append.
+    """
+
+    def __init__(self):
+        self._starts = []
+        self._ends = []
+        self._max_ends = []  # _max_ends[i] = max(_ends[:i + 1])
+
+    def __len__(self):
+        return len(self._starts)
+
+    def add(self, start, end):
+        pos = bisect_right(self._starts, start)
+        self._starts.insert(pos, start)
+        self._ends.insert(pos, end)
+        self._max_ends.insert(pos, end)
+        self._refresh_max_ends(pos)
+
+    def remove(self, start, end):
+        """Remove one stored interval equal to (start, end)."""
+        pos = bisect_left(self._starts, start)
+        while self._ends[pos] != end or self._starts[pos] != start:
+            pos += 1
+        del self._starts[pos], self._ends[pos], self._max_ends[pos]
+        self._refresh_max_ends(pos)
+
+    def _refresh_max_ends(self, pos):
+        running = self._max_ends[pos - 1] if pos else None
+        for i in range(pos, len(self._ends)):
+            if running is None or self._ends[i] > running:
+                running = self._ends[i]
+            self._max_ends[i] = running
+
+    def overlaps(self, start, end):
+        """Does any stored interval (s, e) satisfy s < end and start < e?"""
+        pos = bisect_left(self._starts, end)
+        return pos > 0 and self._max_ends[pos - 1] > start
+
+
+class Schedules:
+    """IntervalSchedule per user id, created on first use."""
+
+    def __init__(self):
+        self._by_user = {}
+
+    def add(self, user_id, start, end):
+        schedule = self._by_user.get(user_id)
+        if schedule is None:
+            schedule = self._by_user[user_id] = IntervalSchedule()
+        schedule.add(start, end)
+
+    def remove(self, user_id, start, end):
+        self._by_user[user_id].remove(start, end)
+
+    def overlaps(self, user_id, start, end):
+        schedule = self._by_user.get(user_id)
+        return schedule is not None and schedule.overlaps(start, end)
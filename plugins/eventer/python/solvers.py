@@ -0,0 +1,118 @@
+import time
+import numpy as np
+from sparse_model import solve_with_cbc, trivial_solution
+
+
+class SolverBackend:
+    """
+    Solves a SparseModel. Every backend returns the same result dict:
+    'status' (PuLP status name), 'proven_optimal', 'values' (column values
+    or None) and the statistics 'first_incumbent_seconds',
+    'mipstart_accepted', 'presolved', 'objective', 'bound' and 'gap'.
+    """
+    name = None
+    takes_mipstart = False  # whether solve() uses `initial`
+
+    def solve(self, model, time_limit=None, gap_rel=None, initial=None):
+        raise NotImplementedError
+
+
+class CbcBackend(SolverBackend):
+    """CBC binary, fed an MPS file (see sparse_model.solve_with_cbc)."""
+    name = "cbc"
+    takes_mipstart = True
+
+    def solve(self, model, time_limit=None, gap_rel=None, initial=None):
+        return solve_with_cbc(model, time_limit=time_limit, gap_rel=gap_rel, initial=initial)
+
+
+class HighsBackend(SolverBackend):
+    """
+    HiGHS through scipy.optimize.milp, in-process and without temp files.
+    The constraint matrix goes in as a scipy.sparse matrix built straight from
+    the model's coordinate arrays. scipy's interface takes no MIP start, so
+    `initial` is ignored.
+    """
+    name = "highs"
+
+    def solve(self, model, time_limit=None, gap_rel=None, initial=None):
+        if model.num_columns == 0:
+            return trivial_solution(model)
+
+        from scipy.optimize import Bounds, LinearConstraint, milp
+        from scipy.sparse import csr_matrix
+
+        indptr, indices = model.csr()
+        matrix = csr_matrix((np.ones(len(indices)), indices, indptr), shape=(model.num_rows, model.num_columns))
+        rhs = model.rhs()
+        lower = np.where(model.senses() == "E", rhs, -np.inf)
+
+        options = {"disp": False}
+        if time_limit is not None:
+            options["time_limit"] = float(time_limit)
+        # Without gap_rel, prove optimality like CBC does instead of HiGHS' default 1e-4 gap
+        options["mip_rel_gap"] = float(gap_rel) if gap_rel is not None else 0.0
+
+        started = time.perf_counter()
+        # milp minimises, so the objective is negated
+        res = milp(-model.costs(),
+                   constraints=[LinearConstraint(matrix, lower, rhs)] if model.num_rows else None,
+                   integrality=np.ones(model.num_columns),
+                   bounds=Bounds(0, 1),
+                   options=options)
+        elapsed = time.perf_counter() - started
+
+        result = {
+            "status": "Undefined",
+            "proven_optimal": False,
+            "values": None,
+            "first_incumbent_seconds": None,
+            "mipstart_accepted": False,
+            "presolved": False,
+            "objective": None,
+            "bound": None,
+            "gap": None,
+        }
+        if res.status == 2:
+            result["status"] = "Infeasible"
+            return result
+        if res.status == 3:
+            result["status"] = "Unbounded"
+            return result
+        if res.x is None:
+            # Stopped (time or node limit) before any feasible solution
+            result["status"] = "Not Solved"
+            return result
+
+        # Status 0 is a proven optimum (within mip_rel_gap); 1 is a limit hit with an incumbent
+        result.update({
+            "status": "Optimal",
+            "proven_optimal": res.status == 0,
+            "values": res.x,
+            # HiGHS reports no incumbent timeline through scipy; the whole solve is an upper bound
+            "first_incumbent_seconds": elapsed,
+            "objective": -res.fun,
+        })
+        dual_bound = getattr(res, "mip_dual_bound", None)
+        if dual_bound is not None:
+            result["bound"] = -dual_bound
+        gap = getattr(res, "mip_gap", None)
+        if gap is not None:
+            result["gap"] = abs(gap)
+        return result
+
+
+SOLVER_BACKENDS = {
+    CbcBackend.name: CbcBackend,
+    HighsBackend.name: HighsBackend,
+}
+
+
+def get_backend(solver):
+    """Backend instance for a solver name ('cbc' or 'highs'); instances pass through."""
+    if isinstance(solver, SolverBackend):
+        return solver
+    try:
+        return SOLVER_BACKENDS[solver]()
+    except KeyError:
+        raise ValueError(f"Unknown ILP solver '{solver}', expected one of {sorted(SOLVER_BACKENDS)}")
@@ -0,0 +1,285 @@
+import os
+import re
+import shutil
+import subprocess
+import tempfile
+import numpy as np
+import pulp
+
+# CBC progress lines, e.g. "Cbc0012I Integer solution of -27 found by ... (0.01 seconds)"
+CBC_INCUMBENT_RE = re.compile(r"^Cbc00\d\dI Integer solution of .*\(([\d.]+) seconds\)", re.MULTILINE)
+# CBC summary lines, e.g. "Objective value:  226.0", "Upper bound:  262.184", "Gap:  -0.14"
+CBC_SUMMARY_RE = re.compile(r"^(Objective value|Upper bound|Lower bound|Gap):\s+(\S+)", re.MULTILINE)
+
+
+class SparseModel:
+    """
+    Binary maximisation model kept as plain index arrays.
+
+    Columns are 0/1 decision variables identified by an arbitrary key, rows
+    are '==' ('E') or '<=' ('L') constraints whose coefficients are all 1, so
+    the constraint matrix is fully described by its (row, column) coordinates.
+    No per-variable or per-constraint Python objects are created.
+    """
+
+    def __init__(self, name="Issue_Assignment"):
+        self.name = name
+        self.keys = []        # column -> key
+        self.row_names = []   # row -> name (only used for diagnostics)
+        self._costs = []
+        self._tie_break = None  # small per-column objective bonus, see set_tie_break
+        self._senses = []
+        self._rhs = []
+        self._row_idx = []
+        self._col_idx = []
+
+    @property
+    def num_columns(self):
+        return len(self.keys)
+
+    @property
+    def num_rows(self):
+        return len(self.row_names)
+
+    @property
+    def num_nonzeros(self):
+        return len(self._col_idx)
+
+    def add_column(self, key, cost):
+        self.keys.append(key)
+        self._costs.append(cost)
+        return len(self.keys) - 1
+
+    def add_cost(self, cols, delta):
+        """Add `delta` to the objective coefficient of every column in `cols`."""
+        for col in cols:
+            self._costs[col] += delta
+
+    def add_row(self, name, cols, sense, rhs):
+        row = len(self.row_names)
+        self.row_names.append(name)
+        self._senses.append(sense)
+        self._rhs.append(rhs)
+        self._row_idx.extend([row] * len(cols))
+        self._col_idx.extend(cols)
+        return row
+
+    def set_tie_break(self, bonus):
+        """
+        Add `bonus` (one value per column) to the objective the solvers see.
+        It only decides between solutions of equal cost, so every solver
+        settles on the same one; objective() leaves it out.
+        """
+        self._tie_break = np.asarray(bonus, dtype=np.float64)
+
+    def costs(self):
+        """Objective coefficients handed to the solvers, tie-break included."""
+        costs = np.asarray(self._costs, dtype=np.float64)
+        if self._tie_break is not None:
+            costs = costs + self._tie_break
+        return costs
+
+    def objective(self, values):
+        """Objective of a solution, without the tie-break."""
+        return float(np.dot(np.asarray(self._costs, dtype=np.float64), np.round(values)))
+
+    def coo(self):
+        """Constraint matrix coordinates as (rows, cols) int64 arrays; every value is 1."""
+        return np.asarray(self._row_idx, dtype=np.int64), np.asarray(self._col_idx, dtype=np.int64)
+
+    def csr(self):
+        """Constraint matrix in CSR form as (indptr, indices) int64 arrays."""
+        rows, cols = self.coo()
+        order = np.argsort(rows, kind="stable")
+        indptr = np.zeros(self.num_rows + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=self.num_rows), out=indptr[1:])
+        return indptr, cols[order]
+
+    def senses(self):
+        return np.asarray(self._senses, dtype="<U1")
+
+    def rhs(self):
+        return np.asarray(self._rhs, dtype=np.float64)
+
+    def is_trivially_feasible(self):
+        """For a model without columns: do all rows hold with every sum equal to 0?"""
+        rhs = self.rhs()
+        senses = self.senses()
+        return bool(np.all(rhs[senses == "E"] == 0) and np.all(rhs[senses == "L"] >= 0))
+
+    def write_mps(self, path):
+        """
+        Write the model as a free-format MPS file in one go. Columns are named
+        C<j> and rows R<i>; the objective is maximised.
+        """
+        rows, cols = self.coo()
+        order = np.lexsort((rows, cols))
+        sorted_rows = rows[order]
+        col_starts = np.searchsorted(cols[order], np.arange(self.num_columns + 1))
+        costs = self.costs().tolist()
+        senses = self._senses
+
+        lines = [f"NAME          {self.name}", "OBJSENSE", "    MAX", "ROWS", " N  OBJ"]
+        lines.extend(f" {senses[i]}  R{i}" for i in range(self.num_rows))
+        lines.append("COLUMNS")
+        lines.append("    MARKER  'MARKER'  'INTORG'")
+        for j in range(self.num_columns):
+            lines.append(f"    C{j}  OBJ  {costs[j]:.12g}")
+            lines.extend(f"    C{j}  R{r}  1" for r in sorted_rows[col_starts[j]:col_starts[j + 1]].tolist())
+        lines.append("    MARKER  'MARKER'  'INTEND'")
+        lines.append("RHS")
+        lines.extend(f"    RHS  R{i}  {rhs:.12g}" for i, rhs in enumerate(self._rhs) if rhs != 0)
+        lines.append("BOUNDS")
+        lines.extend(f" BV BND  C{j}" for j in range(self.num_columns))
+        lines.append("ENDATA")
+
+        with open(path, "w", encoding="utf-8") as f:
+            f.write("\n".join(lines))
+            f.write("\n")
+
+
+def parse_cbc_log(log_text):
+    """
+    Pull solve statistics out of a CBC log.
+    Returns a dict with 'first_incumbent_seconds' (CBC clock, None if no
+    incumbent was reported), 'mipstart_accepted', 'presolved' (presolve left
+    nothing to search, so a MIP start was never looked at), and the final
+    'objective', 'bound' and relative 'gap' (None when CBC did not report them).
+    """
+    stats = {
+        "first_incumbent_seconds": None,
+        "mipstart_accepted": "MIPStart provided solution" in log_text,
+        "presolved": "No integer variables - nothing to do" in log_text,
+        "objective": None,
+        "bound": None,
+        "gap": None,
+    }
+    match = CBC_INCUMBENT_RE.search(log_text)
+    if match:
+        stats["first_incumbent_seconds"] = float(match.group(1))
+
+    summary = {}
+    for key, value in CBC_SUMMARY_RE.findall(log_text):
+        try:
+            summary[key] = float(value)
+        except ValueError:
+            continue
+    stats["objective"] = summary.get("Objective value")
+    stats["bound"] = summary.get("Upper bound", summary.get("Lower bound"))
+    if "Gap" in summary:
+        stats["gap"] = abs(summary["Gap"])
+    elif "Optimal solution found" in log_text and stats["objective"] is not None:
+        # Proven optimal: CBC only prints bound and gap when they differ
+        stats["bound"] = stats["objective"]
+        stats["gap"] = 0.0
+    return stats
+
+
+def read_cbc_solution(path, num_columns):
+    """
+    Read a CBC solution file. Returns (status, proven_optimal, values) where
+    status uses PuLP's status names and values is None without a solution.
+    """
+    with open(path, encoding="utf-8", errors="replace") as f:
+        header = f.readline().split()
+        body = f.readlines()
+
+    word = header[0] if header else ""
+    has_objective = len(header) >= 5 and header[4] == "objective"
+    if word == "Optimal":
+        status, proven_optimal = "Optimal", True
+    elif word == "Stopped" and has_objective:
+        # Stopped on time/gap/nodes with an incumbent
+        status, proven_optimal = "Optimal", False
+    elif word == "Stopped":
+        return "Not Solved", False, None
+    elif word in ("Infeasible", "Integer"):
+        return "Infeasible", False, None
+    elif word == "Unbounded":
+        return "Unbounded", False, None
+    else:
+        return "Undefined", False, None
+
+    values = np.zeros(num_columns, dtype=np.float64)
+    for line in body:
+        parts = line.split()
+        if len(parts) < 3:
+            continue
+        if parts[0] == "**":
+            parts = parts[1:]
+        name = parts[1]
+        if name.startswith("C"):
+            values[int(name[1:])] = float(parts[2])
+    return status, proven_optimal, values
+
+
+def cbc_path():
+    """The CBC binary shipped with PuLP, or one found on PATH."""
+    path = pulp.PULP_CBC_CMD().path
+    if path and os.path.exists(path):
+        return path
+    return shutil.which("cbc")
+
+
+def trivial_solution(model):
+    """
+    Result for a model without columns: nothing to decide, it is feasible iff
+    every row holds with all sums at 0. Solvers cannot read such a model.
+    """
+    feasible = model.is_trivially_feasible()
+    result = parse_cbc_log("")
+    result.update({
+        "status": "Optimal" if feasible else "Infeasible",
+        "proven_optimal": feasible,
+        "values": np.zeros(0) if feasible else None,
+    })
+    if feasible:
+        result.update({"objective": 0.0, "bound": 0.0, "gap": 0.0, "first_incumbent_seconds": 0.0})
+    return result
+
+
+def solve_with_cbc(model, time_limit=None, gap_rel=None, initial=None):
+    """
+    Solve a SparseModel with the CBC binary via an MPS file.
+    Args:
+        model: SparseModel to solve.
+        time_limit: Seconds before CBC stops and returns its best incumbent.
+        gap_rel: Relative gap at which CBC may stop.
+        initial: Optional 0/1 array of column values passed as MIP start.
+    Returns:
+        Dict with 'status' (PuLP status name), 'proven_optimal', 'values'
+        (column values or None) and the statistics from parse_cbc_log.
+    """
+    if model.num_columns == 0:
+        return trivial_solution(model)
+
+    with tempfile.TemporaryDirectory(prefix="eventer-cbc-") as tmp_dir:
+        mps_path = os.path.join(tmp_dir, "model.mps")
+        sol_path = os.path.join(tmp_dir, "model.sol")
+        model.write_mps(mps_path)
+
+        # CBC ignores OBJSENSE in MPS files, so the direction is also given on the command line.
+        args = [cbc_path(), mps_path, "max"]
+        if initial is not None:
+            mst_path = os.path.join(tmp_dir, "model.mst")
+            lines = ["Stopped on time - objective value 0"]
+            lines.extend(f"{j} C{j} {int(v)} 0" for j, v in enumerate(np.asarray(initial).tolist()))
+            with open(mst_path, "w", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n")
+            args += ["mips", mst_path]
+        if time_limit is not None:
+            args += ["sec", str(time_limit)]
+        if gap_rel is not None:
+            args += ["ratio", str(gap_rel)]
+        args += ["timeMode", "elapsed", "solve", "solution", sol_path]
+
+        completed = subprocess.run(args, stdout=subprocess.PIPE, stderr=subprocess.STDOUT,
+                                   stdin=subprocess.DEVNULL, universal_newlines=True)
+        result = parse_cbc_log(completed.stdout)
+        if completed.returncode != 0 or not os.path.exists(sol_path):
+            result.update({"status": "Undefined", "proven_optimal": False, "values": None})
+            return result
+
+        status, proven_optimal, values = read_cbc_solution(sol_path, model.num_columns)
+    result.update({"status": status, "proven_optimal": proven_optimal, "values": values})
+    return result
@@ -6,7 +6,7 @@ sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")
 
 from models import Issue, User
 from process import match_issues_to_users
-sys.setrecursionlimit(5000)  # Adjust as needed
+from eligibility import EligibilityIndex
 
 
 # Load benchmark data
@@ -18,7 +18,9 @@ users = [User(u) for u in data["users"]]
 
 start = time.time()
 strategy = "ilp"
-results = match_issues_to_users(issues, users, strategy= strategy)
+warm_start = True
+stats = {}
+results = match_issues_to_users(issues, users, strategy= strategy, warm_start=warm_start, stats=stats)
 duration = time.time() - start
 
 fully, partial, none = 0, 0, 0
@@ -32,6 +34,22 @@ for issue in issues:
         partial += 1
 print(f"🔍 Benchmarking {len(issues)} issues and {len(users)} users with strategy '{strategy}'")
 print(f"✅ Benchmark complete in {duration:.2f} seconds")
+if stats:
+    first = stats.get("first_incumbent_seconds")
+    print(f"⏱️ Warm start: {stats['warm_start']} (MIPStart accepted: {stats['mipstart_accepted']})")
+    print(f"⏱️ Time to first incumbent: {first:.2f} seconds" if first is not None else "⏱️ No incumbent reported by CBC")
 print(f"✔️ Fully solved: {fully}")
 print(f"⚠️ Partially solved: {partial}")
 print(f"❌ Unsolved: {none}")
+
+# Objective (sum of ratings) of the fast heuristics next to the strategy above
+index = EligibilityIndex(issues, users)
+filled = sum(len(uids) for roles in results.values() for uids in roles.values())
+print(f"🏅 Objective '{strategy}': {index.total_rating(results)} ({filled} seats filled)")
+for heuristic in ("greedy", "greedy_regret"):
+    start = time.time()
+    heuristic_results = match_issues_to_users(issues, users, strategy=heuristic, index=index)
+    heuristic_duration = time.time() - start
+    filled = sum(len(uids) for roles in heuristic_results.values() for uids in roles.values())
+    print(f"🏅 Objective '{heuristic}': {index.total_rating(heuristic_results)} "
+          f"({filled} seats filled, {heuristic_duration:.2f} seconds)")
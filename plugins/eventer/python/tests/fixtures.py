@@ -0,0 +1,59 @@
+"""Issue and user factories shared by the strategy tests."""
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+
+BASE = datetime(2025, 3, 7, 9, 0)
+
+
+def at(hour, day=7):
+    """A start time on the test week, e.g. at(10) for 2025-03-07 10:00."""
+    return datetime(2025, 3, day, hour, 0)
+
+
+def make_issue(issue_id, start, role="Director", hours=2, category="General", assigned_users=(), required_count=1):
+    """One issue needing `required_count` users in `role`, optionally forward-assigned."""
+    return Issue({
+        "id": issue_id, "subject": f"Issue {issue_id}", "category": category,
+        "category_priority": None, "priority": "High",
+        "start_datetime": start.isoformat(),
+        "end_datetime": (start + timedelta(hours=hours)).isoformat(),
+        "required_roles": [{"role": role, "required_count": required_count,
+                            "assigned_users": [{"id": uid, "firstname": "F", "lastname": "A"}
+                                               for uid in assigned_users]}]
+    })
+
+
+def make_user(user_id, ratings, category="General"):
+    """A user rated {role: rating} in one category."""
+    return User({"id": user_id, "firstname": f"User{user_id}", "lastname": "Test", "qualifications": [
+        {"role": role, "category": category, "rating": rating} for role, rating in ratings.items()]})
+
+
+def staggered_issues(count, step_minutes, length_minutes, required):
+    """`count` issues from BASE on, one every `step_minutes`, each needing {role: count} users."""
+    return [
+        Issue({
+            "id": i + 1, "subject": f"Issue {i + 1}", "category": "General",
+            "category_priority": None, "priority": "High",
+            "start_datetime": (BASE + timedelta(minutes=step_minutes * i)).isoformat(),
+            "end_datetime": (BASE + timedelta(minutes=step_minutes * i + length_minutes)).isoformat(),
+            "required_roles": [{"role": role, "required_count": n, "assigned_users": []}
+                               for role, n in required.items()]
+        }) for i in range(count)
+    ]
+
+
+def rated_users(count, ratings):
+    """Users 1..count rated {role: rating(user_id)} in General."""
+    return [make_user(uid, {role: rating(uid) for role, rating in ratings.items()}) for uid in range(1, count + 1)]
+
+
+def scarce_technicians():
+    """25 heavily overlapping issues needing 2 technicians each; 8 users cannot cover them."""
+    return (staggered_issues(25, 15, 120, {"Technician": 2}),
+            rated_users(8, {"Technician": lambda uid: 3 + uid % 4}))
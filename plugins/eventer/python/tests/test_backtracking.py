@@ -0,0 +1,127 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from eligibility import EligibilityIndex
+from algo_backtracking import RatingBound, backtracking_basic
+from process import match_issues_to_users
+from fixtures import BASE, make_issue, make_user, rated_users, staggered_issues
+
+
+def build_issues():
+    return staggered_issues(6, 40, 60, {"Director": 1, "Technician": 2})
+
+
+def build_users():
+    return rated_users(8, {"Director": lambda uid: 2 + uid % 7, "Technician": lambda uid: 9 - uid % 5})
+
+
+class RatingBoundTests(unittest.TestCase):
+
+    def setUp(self):
+        self.issues = build_issues()
+        self.users = build_users()
+        self.index = EligibilityIndex(self.issues, self.users)
+        self.intervals = [(i.start_datetime, i.end_datetime) for i in self.issues]
+
+    def brute_force(self, pos, booked):
+        """Top-k ratings per remaining slot, skipping users booked on an earlier overlapping issue."""
+        total = 0
+        for p in range(pos, len(self.issues)):
+            issue = self.issues[p]
+            start, end = self.intervals[p]
+            for role in issue.required_roles:
+                free = [rating for u, rating, _ in self.index.ranked(issue.id, role.role)
+                        if not any(b_pos < p and self.intervals[b_pos][0] < end and start < self.intervals[b_pos][1]
+                                   for b_user, b_pos in booked if b_user == u.id)]
+                total += sum(free[:role.required_count])
+        return total
+
+    def test_bound_follows_bookings(self):
+        bound = RatingBound(self.issues, self.index, self.intervals)
+        booked = []
+        for user_id, pos in [(1, 0), (2, 0), (3, 1), (1, 2), (4, 3)]:
+            bound.book(user_id, pos)
+            booked.append((user_id, pos))
+            for start in range(len(self.issues)):
+                self.assertEqual(bound.remaining(start), self.brute_force(start, booked))
+
+        while booked:
+            user_id, pos = booked.pop()
+            bound.unbook(user_id, pos)
+            self.assertEqual(bound.remaining(0), self.brute_force(0, booked))
+
+    def test_node_count_is_reported(self):
+        stats = {}
+        result = match_issues_to_users(self.issues, self.users, strategy="backtracking_basic", stats=stats)
+        self.assertTrue(result)
+        self.assertGreaterEqual(stats["nodes"], len(self.issues))
+
+
+
+class IterativeSearchTests(unittest.TestCase):
+
+    def test_deep_search_needs_no_recursion_limit(self):
+        """Thousands of sequential issues used to exceed Python's recursion limit."""
+        base = datetime(2025, 1, 1, 8, 0)
+        issues = [make_issue(i + 1, base + timedelta(hours=2 * i), hours=1) for i in range(3000)]
+        users = build_users()[:1]
+        self.assertLess(sys.getrecursionlimit(), 5000)
+
+        result = backtracking_basic(issues, users)
+        self.assertEqual(len(result), 3000)
+        self.assertTrue(all(roles["Director"] == [1] for roles in result.values()))
+
+    def test_exhaustive_matches_ilp(self):
+        issues, users = build_issues()[:4], build_users()[:6]
+        index = EligibilityIndex(issues, users)
+        ilp = match_issues_to_users(issues, users, index=index)
+        stats = {}
+        exact = match_issues_to_users(issues, users, strategy="backtracking_exact", index=index, stats=stats)
+        self.assertTrue(stats["complete"])
+        self.assertEqual(index.total_rating(exact), index.total_rating(ilp))
+
+    def test_node_budget_returns_best_so_far(self):
+        issues, users = build_issues()[:4], build_users()[:6]
+        index = EligibilityIndex(issues, users)
+        first_fit = backtracking_basic(issues, users, index)
+
+        stats = {}
+        budgeted = backtracking_basic(issues, users, index, stats=stats, max_nodes=10, exhaustive=True)
+        self.assertFalse(stats["complete"])
+        self.assertLessEqual(stats["nodes"], 10)
+        self.assertEqual(budgeted, first_fit, "The first leaf of the exhaustive search is the first-fit result")
+
+
+    def test_parallel_search_matches_serial(self):
+        issues, users = build_issues()[:5], build_users()[:7]
+        index = EligibilityIndex(issues, users)
+        serial = backtracking_basic(issues, users, index, exhaustive=True, max_workers=1)
+
+        stats = {}
+        parallel = backtracking_basic(issues, users, index, stats=stats, exhaustive=True, max_workers=2)
+        self.assertGreater(stats["subproblems"], 1)
+        self.assertTrue(stats["complete"])
+        self.assertEqual(index.total_rating(parallel), index.total_rating(serial))
+
+
+class ForwardCheckingTests(unittest.TestCase):
+
+    def test_dead_end_is_detected_before_reaching_it(self):
+        """The only director covers an all-day issue, which empties the evening issue's domain at once."""
+        issues = [make_issue(1, BASE, "Director", hours=11)]
+        issues += [make_issue(i + 2, BASE + timedelta(hours=i + 1), "Technician", hours=1) for i in range(6)]
+        issues.append(make_issue(8, BASE + timedelta(hours=9), "Director", hours=1))
+        users = [make_user(uid, {"Director" if uid == 1 else "Technician": uid}) for uid in range(1, 5)]
+
+        stats = {}
+        self.assertEqual(backtracking_basic(issues, users, stats=stats, exhaustive=True), {})
+        self.assertTrue(stats["complete"])
+        self.assertLessEqual(stats["nodes"], 1, "Without forward checking all 3^6 technician rotas are tried")
+
+
+if __name__ == "__main__":
+    unittest.main()
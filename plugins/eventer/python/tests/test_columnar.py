@@ -0,0 +1,80 @@
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+from eligibility import EligibilityIndex
+import columnar
+from columnar import ColumnarProblem
+
+
+def random_problem(seed, n_issues=60, n_users=25):
+    rng = random.Random(seed)
+    base = datetime(2025, 3, 1, 8, 0)
+    roles, categories = ["Director", "Technician", "Camera"], ["General", "Sport", None]
+    issues = []
+    for i in range(n_issues):
+        start = base + timedelta(minutes=30 * rng.randrange(0, 24 * 20))
+        issues.append(Issue({
+            "id": i + 1, "subject": f"Issue {i + 1}", "category": rng.choice(categories),
+            "category_priority": None, "priority": "High",
+            "start_datetime": start.isoformat(),
+            "end_datetime": (start + timedelta(hours=rng.randrange(1, 6))).isoformat(),
+            "required_roles": [{"role": role, "required_count": 1, "assigned_users": []}
+                               for role in rng.sample(roles, rng.randrange(1, 4))]
+        }))
+    users = []
+    for uid in range(1, n_users + 1):
+        off_days = []
+        for _ in range(rng.randrange(0, 6)):
+            start = base + timedelta(hours=rng.randrange(0, 24 * 20))
+            off_days.append({"start_datetime": start.isoformat(),
+                             "end_datetime": (start + timedelta(hours=rng.randrange(0, 72))).isoformat()})
+        users.append(User({
+            "id": uid, "firstname": f"User{uid}", "lastname": "Test", "off_days": off_days,
+            "qualifications": [{"role": role, "category": category, "rating": rng.randrange(0, 10)}
+                               for role in roles for category in ("General", "Sport") if rng.random() < 0.5]
+        }))
+    return issues, users
+
+
+class ColumnarEligibilityTests(unittest.TestCase):
+
+    def test_matches_per_pair_checks(self):
+        issues, users = random_problem(11)
+        index = EligibilityIndex(issues, users)
+        for issue in issues:
+            for req_role in issue.required_roles:
+                expected = [(user.id, user.rating(req_role.role, issue.category)) for user in users
+                            if user.rating(req_role.role, issue.category) > 0
+                            and user.is_available(issue.start_datetime, issue.end_datetime)]
+                got = [(user.id, rating) for user, rating, _ in index.candidates(issue.id, req_role.role)]
+                self.assertEqual(got, expected)
+                self.assertTrue(all(type(rating) is int for _, rating in got))
+
+    def test_blocks_give_same_slots(self):
+        issues, users = random_problem(5)
+        whole = [(slot, pos.tolist(), ratings.tolist())
+                 for slot, pos, ratings in ColumnarProblem(issues, users).eligible_slots()]
+        block = columnar.SLOT_BLOCK
+        columnar.SLOT_BLOCK = 7
+        try:
+            blocked = [(slot, pos.tolist(), ratings.tolist())
+                       for slot, pos, ratings in ColumnarProblem(issues, users).eligible_slots()]
+        finally:
+            columnar.SLOT_BLOCK = block
+        self.assertEqual(blocked, whole)
+
+    def test_empty_inputs(self):
+        issues, users = random_problem(2, n_issues=3, n_users=0)
+        index = EligibilityIndex(issues, users)
+        self.assertEqual(index.candidates(1, issues[0].required_roles[0].role), [])
+        self.assertEqual(list(ColumnarProblem([], users).eligible_slots()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from eligibility import EligibilityIndex
+from algo_ILP import decompose, ilp
+from fixtures import make_issue, make_user
+
+
+class DecompositionTests(unittest.TestCase):
+
+    def setUp(self):
+        base = datetime(2025, 3, 7, 10, 0)
+        self.issues = [
+            make_issue(1, base),                                          # overlaps 2, shares users
+            make_issue(2, base + timedelta(hours=1)),
+            make_issue(3, base + timedelta(days=1)),                      # another day
+            make_issue(4, base + timedelta(hours=1), category="Hokej"),  # overlaps 1/2, other staff
+        ]
+        self.users = [
+            make_user(1, {"Director": 9}),
+            make_user(2, {"Director": 7}),
+            make_user(3, {"Director": 8}, "Hokej"),
+        ]
+        self.index = EligibilityIndex(self.issues, self.users)
+
+    def test_components(self):
+        components = decompose(self.issues, self.index)
+        ids = sorted(sorted(issue.id for issue in component) for component in components)
+        self.assertEqual(ids, [[1, 2], [3], [4]])
+
+    def test_parallel_matches_sequential(self):
+        sequential = ilp(self.issues, self.users, filter_penalty=0, index=self.index, max_workers=1)
+        stats = {}
+        parallel = ilp(self.issues, self.users, filter_penalty=0, index=self.index, max_workers=2, stats=stats)
+        self.assertEqual(parallel, sequential)
+        self.assertTrue(stats["parallel"])
+        self.assertEqual(stats["components"], 3)
+        self.assertEqual(parallel[3], {"Director": [1]})
+        self.assertEqual(parallel[4], {"Director": [3]})
+        self.assertEqual(sorted(parallel[1]["Director"] + parallel[2]["Director"]), [1, 2])
+
+    def test_one_infeasible_component_fails_the_run(self):
+        self.issues.append(make_issue(5, datetime(2025, 3, 9, 10, 0), category="Basket"))
+        index = EligibilityIndex(self.issues, self.users)
+        self.assertEqual(ilp(self.issues, self.users, filter_penalty=0, index=index), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
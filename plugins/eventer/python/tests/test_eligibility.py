@@ -0,0 +1,71 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+from eligibility import EligibilityIndex
+from diagnostics import find_candidates
+
+
+class EligibilityIndexTests(unittest.TestCase):
+
+    def setUp(self):
+        self.issues = [Issue({
+            "id": 1, "subject": "Evening Game", "category": "General",
+            "category_priority": None, "priority": "High",
+            "start_datetime": "2025-03-07T19:00:00",
+            "end_datetime": "2025-03-07T21:00:00",
+            "required_roles": [
+                {"role": "Director", "required_count": 1,
+                 "assigned_users": [{"id": 4, "firstname": "Forward", "lastname": "User"}]}
+            ]
+        })]
+        self.users = [
+            User({
+                "id": 1, "firstname": "Low", "lastname": "Rating",
+                "qualifications": [{"role": "Director", "category": "General", "rating": 5}]
+            }),
+            User({
+                "id": 2, "firstname": "Off", "lastname": "Day",
+                "qualifications": [{"role": "Director", "category": "General", "rating": 9}],
+                "off_days": [{"start_datetime": "2025-03-07T00:00:00", "end_datetime": "2025-03-07T23:59:00"}]
+            }),
+            User({
+                "id": 3, "firstname": "Early", "lastname": "Bird",
+                "qualifications": [{"role": "Director", "category": "General", "rating": 8}],
+                "custom_filters": [{
+                    "name": "Only mornings",
+                    "conditions": {"rules": {"and": [{"<": [{"var": "start_time"}, "12:00"]}]}}
+                }]
+            }),
+            User({
+                "id": 5, "firstname": "Wrong", "lastname": "Category",
+                "qualifications": [{"role": "Director", "category": "Hokej", "rating": 10}]
+            }),
+        ]
+        self.index = EligibilityIndex(self.issues, self.users)
+
+    def test_candidates_are_qualified_and_available(self):
+        ids = [u.id for u, _, _ in self.index.candidates(1, "Director")]
+        self.assertEqual(ids, [1, 3])
+
+    def test_filter_violations_are_flagged_not_dropped(self):
+        self.assertTrue(self.index.fails_filter(1, 3, "Director"))
+        self.assertFalse(self.index.fails_filter(1, 1, "Director"))
+        ids = [u.id for u, _, _ in self.index.candidates(1, "Director", include_filtered=False)]
+        self.assertEqual(ids, [1])
+        self.assertEqual([u.id for u in find_candidates(self.users, self.issues[0], "Director", self.index)], [1])
+
+    def test_ranked_and_ratings(self):
+        self.assertEqual([u.id for u, _, _ in self.index.ranked(1, "Director")], [3, 1])
+        self.assertEqual(self.index.rating(1, 3, "Director"), 8)
+        self.assertEqual(self.index.rating(1, 2, "Director"), 0)
+
+    def test_forward_assignments_are_tracked(self):
+        self.assertEqual(self.index.forward_assigned(1, "Director"), [4])
+
+
+if __name__ == "__main__":
+    unittest.main()
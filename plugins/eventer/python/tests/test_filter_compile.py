@@ -0,0 +1,376 @@
+import datetime
+import functools
+import gc
+import multiprocessing
+import os
+import pickle
+import random
+import sys
+import threading
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import filter_eval
+from filter_eval import (compile_batch, compile_filter, evaluate_filter_block, filter_key, filter_variables,
+                         intern_filter, FilterCache, FilterColumns, FilterMemo)
+from models import User, Issue
+from eligibility import EligibilityIndex, issue_context
+from algo_ILP import ilp
+import algo_backtracking
+import test_filter_eval
+
+
+def evaluate_compiled(block, context):
+    return compile_filter(block)(context)
+
+
+class CompiledFilterEvaluatorTests(test_filter_eval.TestFilterEvaluator):
+    """The interpreter scenarios from test_filter_eval, run through compile_filter."""
+
+    def setUp(self):
+        super().setUp()
+        patcher = mock.patch.object(test_filter_eval, "evaluate_filter_block", evaluate_compiled)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+
+def outcome(func, *args):
+    try:
+        return ("ok", func(*args))
+    except Exception as e:
+        return (type(e), str(e))
+
+
+LEAVES = [{"var": "start_time"}, {"var": "end_time"}, {"var": "category"}, {"var": "name"},
+          {"var": "assigned_users"}, {"var": "missing"}, "18:00", "07:30", "EXZ", "Alice", 3, None, ["EXZ", "Bob"]]
+
+CONTEXTS = [
+    {"start_time": datetime.datetime(2025, 3, 17, hour, 0), "end_time": datetime.datetime(2025, 3, 17, 23, 0),
+     "category": category, "name": "Game", "assigned_users": ["Alice", "Bob"]}
+    for hour in (6, 18, 21) for category in ("EXZ", "18:00", None)
+]
+
+
+def random_tree(rng, depth):
+    kind = rng.random()
+    if depth and kind < 0.3:
+        return {rng.choice(["and", "or"]): [random_tree(rng, depth - 1) for _ in range(rng.randrange(0, 4))]}
+    if depth and kind < 0.35:
+        return {"rules": random_tree(rng, depth - 1), "conditions": random_tree(rng, depth - 1)}
+    if kind > 0.95:
+        return rng.choice([{"***": ["A", "B"]}, {"==": ["A"]}, {"==": ["A", "B"], "!=": ["A", "B"]}, {}])
+    return {rng.choice(filter_eval.VALID_OPERATORS): [rng.choice(LEAVES), rng.choice(LEAVES)]}
+
+
+class CompileFilterTests(unittest.TestCase):
+
+    def test_matches_interpreter_on_random_trees(self):
+        rng = random.Random(21)
+        for _ in range(500):
+            block = random_tree(rng, 3)
+            compiled = compile_filter(block)
+            for context in CONTEXTS:
+                self.assertEqual(outcome(compiled, context), outcome(evaluate_filter_block, block, context), block)
+
+    def test_errors_stay_lazy(self):
+        block = {"or": [{"==": ["A", "A"]}, {"***": ["A", "B"]}]}
+        compiled = compile_filter(block)
+        self.assertTrue(compiled({}))
+        with self.assertRaises(ValueError):
+            compile_filter({"and": [{"==": ["A", "A"]}, {"***": ["A", "B"]}]})({})
+
+    def test_literals_are_parsed_once(self):
+        compiled = compile_filter({">=": [{"var": "start_time"}, "18:00"]})
+        with mock.patch.object(filter_eval, "parse_time_literal", side_effect=AssertionError):
+            self.assertTrue(compiled({"start_time": datetime.datetime(2025, 3, 17, 20, 30)}))
+
+
+class FilterMemoTests(unittest.TestCase):
+
+    def test_variables_read(self):
+        block = {"rules": {">=": [{"var": "start_time"}, "18:00"]},
+                 "conditions": {"or": [{"<": [{"var": "start_time"}, {"var": "end_time"}]},
+                                       {"==": [{"var": "category"}, "EXZ"]}]}}
+        self.assertEqual(filter_variables(block), (("category", True), ("end_time", False), ("start_time", True)))
+        self.assertIsNone(filter_variables({"***": ["A", "B"]}))
+
+    def test_weekly_show_is_evaluated_once(self):
+        base = datetime.datetime(2025, 3, 3, 19, 0)
+        issues = [Issue({
+            "id": week + 1, "subject": "Weekly show", "category": "EXZ",
+            "category_priority": None, "priority": "High",
+            "start_datetime": (base + datetime.timedelta(weeks=week)).isoformat(),
+            "end_datetime": (base + datetime.timedelta(weeks=week, hours=2)).isoformat(),
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for week in range(10)]
+        user = User({
+            "id": 1, "firstname": "Eve", "lastname": "Ning",
+            "qualifications": [{"role": "Director", "category": "EXZ", "rating": 5}],
+            "custom_filters": [{"name": "No late starts", "conditions": {
+                "rules": {"<": [{"var": "start_time"}, "18:00"]}}}]
+        })
+
+        memo = FilterMemo()
+        custom_filter = user.custom_filters[0]
+        self.assertFalse(any(memo.matches(custom_filter, issue_context(issue)) for issue in issues))
+        self.assertEqual((memo.misses, memo.hits), (1, 9))
+
+    def test_memo_agrees_with_filter(self):
+        user = User({"id": 1, "firstname": "A", "lastname": "B", "custom_filters": [
+            {"name": "f1", "conditions": {"rules": {">": [{"var": "end_time"}, {"var": "start_time"}]}}},
+            {"name": "f2", "conditions": {"conditions": {"in": [{"var": "name"}, {"var": "assigned_users"}]}}},
+            {"name": "f3", "conditions": {"rules": {"==": [{"var": "category"}, 1]}}},
+        ]})
+        memo = FilterMemo()
+        rng = random.Random(4)
+        for _ in range(300):
+            start = datetime.datetime(2025, 3, 1, 8) + datetime.timedelta(hours=rng.randrange(0, 200))
+            context = {"start_time": start, "end_time": start + datetime.timedelta(hours=rng.randrange(-30, 30)),
+                       "category": rng.choice([1, 1.0, True, "1"]), "name": rng.choice(["Alice", "Bob"]),
+                       "assigned_users": rng.choice([["Alice"], ["Bob"], []])}
+            for cf in user.custom_filters:
+                self.assertEqual(outcome(memo.matches, cf, context), outcome(cf.matches, context))
+        self.assertGreater(memo.hits, 0)
+
+
+class BatchFilterTests(unittest.TestCase):
+
+    def test_masks_match_interpreter(self):
+        rng = random.Random(8)
+        columns = FilterColumns(CONTEXTS)
+        batched = succeeded = 0
+        for _ in range(500):
+            block = random_tree(rng, 3)
+            batch = compile_batch(block)
+            mask = batch(columns) if batch is not None else None
+            expected = [outcome(evaluate_filter_block, block, context) for context in CONTEXTS]
+            succeeded += all(kind == "ok" for kind, _ in expected)
+            if mask is None:
+                continue
+            batched += 1
+            self.assertEqual([("ok", bool(value)) for value in mask],
+                             [(kind, bool(value)) for kind, value in expected], block)
+        # Only filters that avoid an error through short-circuiting need the per-issue path
+        self.assertGreater(batched, 0.8 * succeeded)
+
+    def test_time_of_day_uses_integer_columns(self):
+        batch = compile_batch({"and": [{">=": [{"var": "start_time"}, "18:00"]}, {"!=": [{"var": "category"}, "EXZ"]}]})
+        columns = FilterColumns(CONTEXTS)
+        with mock.patch.object(filter_eval, "_COMPARISONS", {}):
+            mask = batch(columns)
+        self.assertEqual(mask.tolist(), [c["start_time"].hour >= 18 and c["category"] != "EXZ" for c in CONTEXTS])
+
+    def test_index_falls_back_when_batch_raises(self):
+        """None < "M" raises, but the interpreter never gets there for the issue without a category."""
+        issues = [Issue({
+            "id": i + 1, "subject": "Game", "category": category,
+            "category_priority": None, "priority": "High",
+            "start_datetime": f"2025-03-17T{hour}:00:00", "end_datetime": f"2025-03-17T{hour}:30:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for i, (category, hour) in enumerate([("EXZ", 10), ("ABC", 19), (None, 20), ("Sport", 21)])]
+        filters = [
+            {"name": "short-circuit", "conditions": {"rules": {"or": [{"==": [{"var": "category"}, None]},
+                                                                     {"<": [{"var": "category"}, "M"]}]}}},
+            {"name": "evening", "conditions": {"rules": {">=": [{"var": "start_time"}, "18:00"]}}},
+        ]
+        users = [User({"id": uid, "firstname": "U", "lastname": "V", "custom_filters": [cf],
+                       "qualifications": [{"role": "Director", "category": c, "rating": 5}
+                                          for c in ("EXZ", "ABC", "Sport")]})
+                 for uid, cf in enumerate(filters, start=1)]
+        columns = FilterColumns([issue_context(issue) for issue in issues])
+        self.assertIsNone(users[0].custom_filters[0].batch(columns))
+        self.assertIsNotNone(users[1].custom_filters[0].batch(columns))
+
+        index = EligibilityIndex(issues, users)
+        for issue in issues:
+            for user in users:
+                expected = not evaluate_filter_block(user.custom_filters[0].conditions, issue_context(issue))
+                self.assertEqual(index.fails_filter(issue.id, user.id, "Director"), expected)
+
+class FilterInterningTests(unittest.TestCase):
+
+    def test_identical_conditions_share_one_compiled_filter(self):
+        rules, conditions = {"<": [{"var": "start_time"}, "22:00"]}, {"==": [{"var": "category"}, "EXZ"]}
+        late = {"rules": rules, "conditions": conditions}
+        reordered = {"conditions": dict(conditions), "rules": dict(rules)}
+        users = [User({"id": uid, "firstname": "U", "lastname": str(uid),
+                       "custom_filters": [{"name": f"copy {uid}", "conditions": late if uid % 2 else reordered}]})
+                 for uid in range(1, 7)]
+        self.assertEqual(len({id(u.custom_filters[0].compiled) for u in users}), 1)
+        self.assertEqual({u.custom_filters[0].name for u in users}, {f"copy {uid}" for uid in range(1, 7)})
+
+        other = User({"id": 9, "firstname": "U", "lastname": "9", "custom_filters": [
+            {"name": "later", "conditions": {"rules": {"<": [{"var": "start_time"}, "23:00"]}}}]})
+        self.assertIsNot(other.custom_filters[0].compiled, users[0].custom_filters[0].compiled)
+
+    def test_literal_types_do_not_collide(self):
+        as_string = {"==": [{"var": "start_time"}, "18:00:00"]}
+        as_time = {"==": [{"var": "start_time"}, datetime.time(18, 0)]}
+        self.assertNotEqual(filter_key(as_string), filter_key(as_time))
+        self.assertNotEqual(filter_key({"==": ["A", 1]}), filter_key({"==": ["A", True]}))
+        self.assertIsNot(intern_filter(as_string), intern_filter(as_time))
+
+    def test_evicted_filters_are_released_once_unused(self):
+        conditions = {"rules": {"==": [{"var": "name"}, "Released once unused"]}}
+        key = filter_key(conditions)
+        with mock.patch.object(filter_eval, "FILTER_CACHE", FilterCache(maxsize=0)) as cache:
+            user = User({"id": 1, "firstname": "U", "lastname": "V", "custom_filters": [
+                {"name": "f", "conditions": conditions}]})
+            self.assertIs(intern_filter(conditions), user.custom_filters[0].compiled)
+            self.assertEqual((cache.hits, cache.misses, len(cache)), (1, 1, 0))
+            del user
+            gc.collect()
+            self.assertNotIn(key, cache._live)
+
+    def test_shared_filter_fans_out_to_every_user(self):
+        issues = [Issue({
+            "id": hour, "subject": "Show", "category": "EXZ", "category_priority": None, "priority": "High",
+            "start_datetime": f"2025-03-17T{hour:02d}:00:00", "end_datetime": f"2025-03-17T{hour:02d}:30:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for hour in (9, 19, 23)]
+        users = [User({"id": uid, "firstname": "U", "lastname": "V",
+                       "qualifications": [{"role": "Director", "category": "EXZ", "rating": 5}],
+                       "custom_filters": [{"name": "no late events",
+                                           "conditions": {"rules": {"<": [{"var": "start_time"}, "22:00"]}}}]})
+                 for uid in range(1, 21)]
+        calls = []
+        compiled = users[0].custom_filters[0].compiled
+        batch = compiled.batch
+        with mock.patch.object(compiled, "batch", lambda columns: calls.append(1) or batch(columns)):
+            index = EligibilityIndex(issues, users)
+        self.assertEqual(len(calls), 1)
+        for user in users:
+            self.assertEqual([index.fails_filter(issue.id, user.id, "Director") for issue in issues],
+                             [False, False, True])
+
+
+class FilterPicklingTests(unittest.TestCase):
+    """Users travel to worker processes, so their compiled filters must survive pickling."""
+
+    def setUp(self):
+        self.issues = [Issue({
+            "id": day * 100 + hour, "subject": "Show", "category": "EXZ", "category_priority": None,
+            "priority": "High", "start_datetime": f"2025-03-{day:02d}T{hour:02d}:00:00",
+            "end_datetime": f"2025-03-{day:02d}T{hour:02d}:30:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for day in (17, 18) for hour in (9, 23)]
+        self.users = [User({"id": uid, "firstname": "U", "lastname": str(uid),
+                            "qualifications": [{"role": "Director", "category": "EXZ", "rating": 5 + uid}],
+                            "custom_filters": [{"name": "no late events",
+                                                "conditions": {"rules": {"<": [{"var": "start_time"}, "22:00"]}}}]
+                            if uid > 1 else []})
+                      for uid in range(1, 4)]
+
+    def test_user_round_trip(self):
+        user = pickle.loads(pickle.dumps(self.users[2]))
+        custom_filter = user.custom_filters[0]
+        self.assertEqual(custom_filter.name, "no late events")
+        self.assertIs(custom_filter.compiled, self.users[2].custom_filters[0].compiled)
+        self.assertEqual([custom_filter.evaluate_for_issue(issue) for issue in self.issues],
+                         [True, False, True, False])
+
+    def test_parallel_ilp(self):
+        stats = {}
+        parallel = ilp(self.issues, self.users, max_workers=2, stats=stats)
+        self.assertTrue(stats["parallel"])
+        self.assertEqual(parallel, ilp(self.issues, self.users, max_workers=1))
+        self.assertEqual(parallel[1723], {"Director": [1]})
+
+    def test_parallel_ilp_with_unbatchable_filter(self):
+        """None < "M" makes the batch path give up, so results land in the memo the component indexes share."""
+        issues = [Issue({
+            "id": day * 100 + hour, "subject": "Game", "category": category, "category_priority": None,
+            "priority": "High", "start_datetime": f"2025-03-{day:02d}T{hour:02d}:00:00",
+            "end_datetime": f"2025-03-{day:02d}T{hour:02d}:30:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for day, category in ((17, "EXZ"), (18, None)) for hour in (9, 23)]
+        users = [User({"id": uid, "firstname": "U", "lastname": str(uid),
+                       "qualifications": [{"role": "Director", "category": "EXZ", "rating": 5 + uid}],
+                       "custom_filters": [{"name": "short-circuit", "conditions": {"rules": {"or": [
+                           {"==": [{"var": "category"}, None]}, {"<": [{"var": "category"}, "M"]}]}}}]})
+                 for uid in range(1, 3)]
+        index = EligibilityIndex(issues, users)
+        self.assertGreater(index.filter_memo.misses, 0)
+        stats = {}
+        parallel = ilp(issues, users, index=index, max_workers=2, stats=stats)
+        self.assertTrue(stats["parallel"])
+        self.assertEqual(parallel, ilp(issues, users, index=index, max_workers=1))
+
+    def test_parallel_exhaustive_search_under_spawn(self):
+        index = EligibilityIndex(self.issues, self.users)
+        serial = algo_backtracking.backtracking_basic(self.issues, self.users, index, exhaustive=True, max_workers=1)
+        # What the pool does by default on macOS and Windows: a fresh interpreter gets pickled arguments
+        spawn = multiprocessing.get_context("spawn")
+        stats = {}
+        with mock.patch.object(algo_backtracking, "multiprocessing", spawn), \
+                mock.patch.object(algo_backtracking, "ProcessPoolExecutor",
+                                  functools.partial(algo_backtracking.ProcessPoolExecutor, mp_context=spawn)):
+            parallel = algo_backtracking.backtracking_basic(self.issues, self.users, index, stats=stats,
+                                                            exhaustive=True, max_workers=2)
+        self.assertEqual(parallel, serial)
+        self.assertGreater(stats["subproblems"], 1)
+
+
+class FilterCacheTests(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = FilterCache(maxsize=2)
+        self.filters = [{"rules": {"==": [{"var": "category"}, name]}} for name in ("A", "B", "C")]
+
+    def test_lru_eviction_and_stats(self):
+        a, b, c = [self.cache.get(filter_key(f), f) for f in self.filters]
+        # A was evicted but is still held by `a`: a hit through the weak table, which evicts B
+        self.assertIs(self.cache.get(filter_key(self.filters[0]), self.filters[0]), a)
+        self.cache.get(filter_key(self.filters[2]), self.filters[2])
+        self.cache.get(filter_key(self.filters[0]), self.filters[0])
+        self.assertEqual(list(self.cache._lru), [filter_key(self.filters[2]), filter_key(self.filters[0])])
+        self.assertEqual(self.cache.stats(), {"size": 2, "maxsize": 2, "hits": 3, "misses": 3, "evictions": 2})
+
+    def test_concurrent_requests_compile_once(self):
+        """Request threads racing on one filter: a slow compile must not let a second thread compile it too."""
+        compile_real = filter_eval.CompiledFilter
+
+        def compile_slowly(*args):
+            time.sleep(0.05)
+            return compile_real(*args)
+
+        results = []
+        key, conditions = filter_key(self.filters[0]), self.filters[0]
+        with mock.patch.object(filter_eval, "CompiledFilter", compile_slowly):
+            threads = [threading.Thread(target=lambda: results.append(self.cache.get(key, conditions)))
+                       for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len({id(compiled) for compiled in results}), 1)
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 3))
+
+    def test_repeated_requests_compile_once(self):
+        with mock.patch.object(filter_eval, "FILTER_CACHE", self.cache):
+            for _ in range(3):
+                users = [User({"id": 1, "firstname": "U", "lastname": "V", "custom_filters": [
+                    {"name": "f", "conditions": self.filters[0]}]})]
+                del users
+                gc.collect()
+        self.assertEqual((self.cache.misses, self.cache.hits), (1, 2))
+
+    def test_run_algorithm_reports_cache_stats(self):
+        try:
+            import main
+        except ImportError as e:
+            self.skipTest(f"service dependencies missing: {e}")
+        with mock.patch.object(main, "send_assignments_to_redmine"):
+            response = main.app.test_client().post("/run_algorithm", json={"strategy": "greedy", "data": {
+                "issues": [], "users": [{"id": 1, "firstname": "U", "lastname": "V", "custom_filters": [
+                    {"name": "f", "conditions": self.filters[1]}]}]}})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.get_json()["filter_cache"], filter_eval.FILTER_CACHE.stats())
+        self.assertEqual(main.app.test_client().get("/filter_cache").get_json(), filter_eval.FILTER_CACHE.stats())
+
+
+if __name__ == "__main__":
+    unittest.main()
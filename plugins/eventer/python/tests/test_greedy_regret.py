@@ -0,0 +1,68 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User
+from eligibility import EligibilityIndex
+from process import match_issues_to_users
+from fixtures import make_issue, scarce_technicians
+
+
+class GreedyRegretTests(unittest.TestCase):
+
+    def test_scarce_specialist_is_kept(self):
+        """Plain greedy gives the specialist to the earlier issue and strands the later one."""
+        base = datetime(2025, 3, 7, 10, 0)
+        issues = [make_issue(1, base, "Director"), make_issue(2, base + timedelta(hours=1), "Technician")]
+        users = [
+            User({"id": 1, "firstname": "Spec", "lastname": "Ialist", "qualifications": [
+                {"role": "Director", "category": "General", "rating": 9},
+                {"role": "Technician", "category": "General", "rating": 7}]}),
+            User({"id": 2, "firstname": "Only", "lastname": "Director", "qualifications": [
+                {"role": "Director", "category": "General", "rating": 8}]}),
+        ]
+
+        greedy = match_issues_to_users(issues, users, strategy="greedy")
+        self.assertEqual(greedy[2]["Technician"], [])
+
+        regret = match_issues_to_users(issues, users, strategy="greedy_regret")
+        self.assertEqual(regret, {1: {"Director": [2]}, 2: {"Technician": [1]}})
+
+    def test_regret_beats_time_order(self):
+        """Both slots have one spare candidate; the later one loses far more without its best user."""
+        base = datetime(2025, 3, 7, 10, 0)
+        issues = [make_issue(1, base, "Director", category="Early"),
+                  make_issue(2, base + timedelta(hours=1), "Director", category="Late")]
+        users = [
+            User({"id": 1, "firstname": "Late", "lastname": "Star", "qualifications": [
+                {"role": "Director", "category": "Early", "rating": 5},
+                {"role": "Director", "category": "Late", "rating": 9}]}),
+            User({"id": 2, "firstname": "Early", "lastname": "Bird", "qualifications": [
+                {"role": "Director", "category": "Early", "rating": 4},
+                {"role": "Director", "category": "Late", "rating": 1}]}),
+        ]
+        index = EligibilityIndex(issues, users)
+
+        greedy = match_issues_to_users(issues, users, strategy="greedy", index=index)
+        self.assertEqual(greedy, {1: {"Director": [1]}, 2: {"Director": [2]}})
+        self.assertEqual(index.total_rating(greedy), 6)
+
+        regret = match_issues_to_users(issues, users, strategy="greedy_regret", index=index)
+        self.assertEqual(regret, {1: {"Director": [2]}, 2: {"Director": [1]}})
+        self.assertEqual(index.total_rating(regret), 13)
+
+    def test_never_worse_coverage_on_uniform_staff(self):
+        issues, users = scarce_technicians()
+        index = EligibilityIndex(issues, users)
+        greedy = match_issues_to_users(issues, users, strategy="greedy", index=index)
+        regret = match_issues_to_users(issues, users, strategy="greedy_regret", index=index)
+        count = lambda result: sum(len(uids) for roles in result.values() for uids in roles.values())
+        self.assertGreaterEqual(count(regret), count(greedy))
+        self.assertGreaterEqual(index.total_rating(regret), index.total_rating(greedy))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,46 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from eligibility import EligibilityIndex
+from algo_greedy import greedy, local_search
+from process import match_issues_to_users
+from fixtures import at, make_issue, make_user
+
+
+class LocalSearchTests(unittest.TestCase):
+
+    def test_fills_seat_by_shifting_a_busy_user(self):
+        issues = [make_issue(1, at(10), "Director"), make_issue(2, at(11), "Technician")]
+        users = [make_user(1, {"Director": 9, "Technician": 5}), make_user(2, {"Director": 3, "Technician": 0})]
+        index = EligibilityIndex(issues, users)
+
+        start = greedy(issues, users, index)
+        self.assertEqual(start, {1: {"Director": [1]}, 2: {"Technician": []}})
+
+        improved = local_search(issues, start, index)
+        self.assertEqual(improved, {1: {"Director": [2]}, 2: {"Technician": [1]}})
+        self.assertEqual(start[2]["Technician"], [], "The input assignment must not change")
+
+    def test_swaps_users_between_overlapping_issues(self):
+        issues = [make_issue(1, at(10), "Director"), make_issue(2, at(11), "Technician")]
+        users = [make_user(1, {"Director": 9, "Technician": 10}), make_user(2, {"Director": 8, "Technician": 2})]
+        index = EligibilityIndex(issues, users)
+
+        result = greedy(issues, users, index, improve_seconds=1.0)
+        self.assertEqual(result, {1: {"Director": [2]}, 2: {"Technician": [1]}})
+        self.assertEqual(index.total_rating(result), 18)
+
+    def test_forward_assignments_stay(self):
+        issues = [make_issue(1, at(10), "Director", assigned_users=[2]), make_issue(2, at(11), "Technician")]
+        users = [make_user(1, {"Director": 9, "Technician": 10}), make_user(2, {"Director": 8, "Technician": 2})]
+
+        result = match_issues_to_users(issues, users, strategy="greedy_ls")
+        self.assertEqual(result[1]["Director"], [2])
+        self.assertEqual(result[2]["Technician"], [1])
+
+
+if __name__ == "__main__":
+    unittest.main()
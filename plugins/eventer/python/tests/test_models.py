@@ -0,0 +1,95 @@
+import os
+import pickle
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import AssignedUser, Issue, User
+
+
+ISSUE = {
+    "id": 1, "subject": "Concert", "category": "General",
+    "category_priority": None, "priority": "High",
+    "start_datetime": "2025-03-07T10:00:00", "end_datetime": "2025-03-07T12:00:00",
+    "required_roles": [{"role": "Director", "required_count": 1,
+                        "assigned_users": [{"id": 6, "firstname": "Martin", "lastname": "Duri"}]}]
+}
+
+USER = {
+    "id": 2, "firstname": "Alice", "lastname": "Smith",
+    "qualifications": [{"role": "Director", "category": "General", "rating": 7}],
+    "off_days": [{"start_datetime": "2025-03-08T00:00:00", "end_datetime": "2025-03-08T23:59:59"}],
+}
+
+
+class CompactModelTests(unittest.TestCase):
+
+    def test_forward_assigned_users_are_references(self):
+        issue = Issue(ISSUE)
+        assigned = issue.required_roles[0].assigned_users[0]
+        self.assertIsInstance(assigned, AssignedUser)
+        self.assertEqual((assigned.id, assigned.firstname), (6, "Martin"))
+        self.assertFalse(hasattr(assigned, "qualifications"))
+
+    def test_no_instance_dicts(self):
+        issue, user = Issue(ISSUE), User(USER)
+        for obj in (issue, issue.required_roles[0], user, user.qualifications[0], user.off_days[0]):
+            self.assertFalse(hasattr(obj, "__dict__"), type(obj).__name__)
+
+    def test_role_and_category_strings_are_shared(self):
+        issue, user = Issue(ISSUE), User(USER)
+        qualification = user.qualifications[0]
+        self.assertIs(issue.required_roles[0].role, qualification.role)
+        self.assertIs(issue.category, qualification.category)
+
+    def test_models_survive_pickling(self):
+        """Worker processes receive issues and users by pickle."""
+        issue = pickle.loads(pickle.dumps(Issue(ISSUE)))
+        user = pickle.loads(pickle.dumps(User(USER)))
+        self.assertEqual(issue.required_roles[0].assigned_users[0].id, 6)
+        self.assertEqual(user.get_role_rating("Director", "General"), 7)
+        self.assertFalse(user.is_available(issue.start_datetime.replace(day=8), issue.end_datetime.replace(day=8)))
+
+    def test_rating_lookup(self):
+        user = User(dict(USER, qualifications=[
+            {"role": "Director", "category": "General", "rating": 4},
+            {"role": "Director", "category": "Sport", "rating": 9},
+            {"role": "Director", "category": "General", "rating": 1},
+        ]))
+        self.assertEqual(user.rating("Director", "General"), 4, "The first listed qualification wins")
+        self.assertEqual(user.rating("Director", "Sport"), 9)
+        self.assertEqual(user.rating("Director", None), 9)
+        self.assertEqual(user.rating("Director", "Music"), 0)
+        self.assertEqual(user.rating("Technician", None), 0)
+        self.assertEqual(user.get_role_rating("Director", "Sport"), 9)
+
+    def test_availability_matches_off_day_scan(self):
+        """Merged off-days answer exactly like checking every OffDay, touching ends included."""
+        rng = random.Random(3)
+        base = datetime(2025, 3, 1)
+        off_days = []
+        for _ in range(40):
+            start = base + timedelta(hours=rng.randrange(0, 24 * 60))
+            end = start + timedelta(hours=rng.choice([0, 1, 8, 24, 24 * 7]))
+            off_days.append({"start_datetime": start.isoformat(), "end_datetime": end.isoformat()})
+        user = User(dict(USER, off_days=off_days))
+        self.assertLess(len(user._off_starts), len(user.off_days))
+
+        windows = []
+        for _ in range(500):
+            start = base + timedelta(hours=rng.randrange(-24, 24 * 62))
+            windows.append((start, start + timedelta(hours=rng.randrange(0, 12))))
+        windows += [(od.end_datetime, od.end_datetime + timedelta(hours=1)) for od in user.off_days]
+        windows += [(od.start_datetime - timedelta(hours=1), od.start_datetime) for od in user.off_days]
+
+        expected = [not any(od.conflicts_with(s, e) for od in user.off_days) for s, e in windows]
+        self.assertEqual([user.is_available(s, e) for s, e in windows], expected)
+        self.assertEqual([user.is_available(s, None) for s, _ in windows],
+                         [not any(od.conflicts_with(s, None) for od in user.off_days) for s, _ in windows])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import os
+import sys
+import unittest
+from datetime import datetime, timedelta
+from itertools import combinations
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+from process import match_issues_to_users
+from helper import overlap_cliques
+
+
+def overlaps(a, b):
+    return a[1] < b[2] and b[1] < a[2]
+
+
+class OverlapCliqueTests(unittest.TestCase):
+
+    def test_chain_of_overlaps(self):
+        """A-B and B-C overlap, A-C only touch: two cliques, no A-C row."""
+        base = datetime(2025, 3, 7, 10, 0)
+        intervals = [
+            ("A", base, base + timedelta(hours=2)),
+            ("B", base + timedelta(hours=1), base + timedelta(hours=3)),
+            ("C", base + timedelta(hours=2), base + timedelta(hours=4)),
+        ]
+        cliques = [sorted(c) for c in overlap_cliques(intervals)]
+        self.assertEqual(sorted(cliques), [["A", "B"], ["B", "C"]])
+
+    def test_every_overlapping_pair_is_covered(self):
+        """Each overlapping pair shares a clique and each clique is pairwise overlapping."""
+        base = datetime(2025, 3, 7, 8, 0)
+        intervals = [
+            (i, base + timedelta(minutes=25 * i), base + timedelta(minutes=25 * i + 30 + 20 * (i % 4)))
+            for i in range(30)
+        ]
+        intervals.append(("point", base + timedelta(minutes=100), base + timedelta(minutes=100)))
+        by_key = {iv[0]: iv for iv in intervals}
+        cliques = overlap_cliques(intervals)
+
+        covered = set()
+        for clique in cliques:
+            for k1, k2 in combinations(clique, 2):
+                self.assertTrue(overlaps(by_key[k1], by_key[k2]), f"{k1} and {k2} do not overlap")
+                covered.add(frozenset((k1, k2)))
+
+        for a, b in combinations(intervals, 2):
+            if overlaps(a, b):
+                self.assertIn(frozenset((a[0], b[0])), covered)
+
+    def test_ilp_respects_clique_rows(self):
+        """Three mutually overlapping issues need three distinct users."""
+        issues = [
+            Issue({
+                "id": i, "subject": f"Issue {i}", "category": "General",
+                "category_priority": None, "priority": "High",
+                "start_datetime": f"2025-03-07T1{i}:00:00",
+                "end_datetime": "2025-03-07T18:00:00",
+                "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+            }) for i in range(1, 4)
+        ]
+        users = [User({
+            "id": uid, "firstname": "Test", "lastname": "User",
+            "qualifications": [{"role": "Director", "category": "General", "rating": uid}]
+        }) for uid in range(1, 4)]
+
+        results = match_issues_to_users(issues, users)
+        assigned = [uid for roles in results.values() for uids in roles.values() for uid in uids]
+        self.assertEqual(sorted(assigned), [1, 2, 3])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,106 @@
+import os
+import sys
+import unittest
+from datetime import datetime
+
+import numpy as np
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from helper import _strip_offset, parse_datetime, parse_datetimes, parse_epochs
+from columnar import to_epoch
+from models import Issue, User, initialize_data
+
+
+class ParseDatetimeTests(unittest.TestCase):
+
+    def test_timezones_are_dropped(self):
+        expected = datetime(2025, 3, 7, 10, 0)
+        for value in ("2025-03-07T10:00:00", "2025-03-07T10:00:00Z", "2025-03-07T10:00:00+02:00",
+                      "2025-03-07T10:00:00-05:00"):
+            self.assertEqual(parse_datetime(value), expected, value)
+        self.assertIsNone(parse_datetime(""))
+        self.assertIsNone(parse_datetime(None))
+
+    def test_errors_are_not_cached(self):
+        for _ in range(2):
+            with self.assertRaisesRegex(ValueError, "Unable to parse datetime"):
+                parse_datetime("tomorrow")
+
+    def test_repeated_strings_hit_the_cache(self):
+        value = "2031-01-02T03:04:05Z"
+        self.assertIs(parse_datetime(value), parse_datetime(value))
+
+    def test_bulk_parse_matches_single(self):
+        values = ["2025-03-07T10:00:00", "2025-03-07T10:00:00.250000", "2025-03-07 18:30",
+                  "2025-03-07T10:00:00Z", "2025-12-31T23:59:59+01:00", "2025-03-08"]
+        expected = to_epoch([parse_datetime(v) for v in values])
+        np.testing.assert_array_equal(parse_epochs(values), expected)
+        self.assertEqual(parse_datetimes(values), [parse_datetime(v) for v in values])
+
+    def test_bulk_parse_falls_back_for_other_forms(self):
+        """Forms NumPy rejects (offsets without a colon, basic format) are left to fromisoformat."""
+        values = ["2025-03-07T10:00:00", "2025-03-07T10:00:00.5"]
+        if sys.version_info >= (3, 11):
+            values += ["2025-03-07T10:00:00+0100", "20250307T100000"]
+        expected = to_epoch([parse_datetime(v) for v in values])
+        np.testing.assert_array_equal(parse_epochs(values), expected)
+
+    def test_bulk_parse_rejects_what_parse_datetime_rejects(self):
+        """NumPy reads these as timestamps; the bulk path must raise like parse_datetime does."""
+        for value in ("now", "today", "2025-01", "2025"):
+            with self.assertRaises(ValueError, msg=value):
+                parse_datetime(value)
+            with self.assertRaisesRegex(ValueError, "Unable to parse datetime", msg=value):
+                parse_epochs(["2025-03-07T10:00:00", value])
+            with self.assertRaisesRegex(ValueError, "Unable to parse datetime", msg=value):
+                parse_datetimes([value])
+
+    def test_initialize_data_rejects_other_strings(self):
+        issue = {"id": 1, "subject": "A", "category": "EXZ", "category_priority": None, "priority": "High",
+                 "start_datetime": "now", "required_roles": []}
+        with self.assertRaisesRegex(ValueError, "Unable to parse datetime"):
+            initialize_data({"issues": [issue], "users": []})
+        user = {"id": 1, "firstname": "U", "lastname": "1",
+                "off_days": [{"start_datetime": "2025-01", "end_datetime": "2025-03-07T23:59:59"}]}
+        with self.assertRaisesRegex(ValueError, "Unable to parse datetime"):
+            initialize_data({"issues": [], "users": [user]})
+
+    def test_empty_values(self):
+        self.assertEqual(_strip_offset(""), "")
+        self.assertIsNone(_strip_offset(None))
+        self.assertTrue(np.all(np.isnat(parse_epochs(["", None]).astype("datetime64[us]"))))
+        self.assertEqual(parse_datetimes(["", None, "2025-03-07T10:00:00Z"]),
+                         [None, None, datetime(2025, 3, 7, 10, 0)])
+        self.assertEqual(parse_datetimes([]), [])
+
+    def test_initialize_data_matches_the_constructors(self):
+        data = {
+            "issues": [
+                {"id": 1, "subject": "A", "category": "EXZ", "category_priority": None, "priority": "High",
+                 "start_datetime": "2025-03-07T10:00:00Z", "end_datetime": "2025-03-07T12:00:00+01:00",
+                 "required_roles": []},
+                {"id": 2, "subject": "B", "category": "EXZ", "category_priority": None, "priority": "High",
+                 "start_datetime": "2025-03-07T18:30:00", "end_datetime": None, "required_roles": []},
+            ],
+            "users": [
+                {"id": 1, "firstname": "U", "lastname": "1", "off_days": [
+                    {"start_datetime": "2025-03-07T00:00:00Z", "end_datetime": "2025-03-07T23:59:59Z"},
+                    {"start_datetime": "2025-03-09T08:00:00", "end_datetime": "2025-03-09T12:00:00"}]},
+                {"id": 2, "firstname": "U", "lastname": "2"},
+                {"id": 3, "firstname": "U", "lastname": "3", "off_days": [
+                    {"start_datetime": "2025-03-08T00:00:00", "end_datetime": "2025-03-08T23:59:59"}]},
+            ],
+        }
+        issues, users = initialize_data(data)
+        expected_issues = [Issue(i) for i in data["issues"]]
+        expected_users = [User(u) for u in data["users"]]
+        self.assertEqual([(i.start_datetime, i.end_datetime) for i in issues],
+                         [(i.start_datetime, i.end_datetime) for i in expected_issues])
+        self.assertEqual([[(od.start_datetime, od.end_datetime) for od in u.off_days] for u in users],
+                         [[(od.start_datetime, od.end_datetime) for od in u.off_days] for u in expected_users])
+        self.assertEqual(data["issues"][0]["start_datetime"], "2025-03-07T10:00:00Z", "The request is not modified")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+import os
+import sys
+import unittest
+from itertools import combinations
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from process import match_issues_to_users
+from eligibility import EligibilityIndex
+from fixtures import scarce_technicians
+
+
+def filled(result):
+    return sum(len(uids) for roles in result.values() for uids in roles.values())
+
+
+class SoftCoverageTests(unittest.TestCase):
+
+    def setUp(self):
+        self.issues, self.users = scarce_technicians()
+
+    def assert_schedule_valid(self, result):
+        by_id = {issue.id: issue for issue in self.issues}
+        for issue in self.issues:
+            for req in issue.required_roles:
+                self.assertLessEqual(len(result[issue.id].get(req.role, [])), req.required_count)
+        for (id_a, roles_a), (id_b, roles_b) in combinations(result.items(), 2):
+            a, b = by_id[id_a], by_id[id_b]
+            if a.start_datetime < b.end_datetime and b.start_datetime < a.end_datetime:
+                users_a = {uid for uids in roles_a.values() for uid in uids}
+                users_b = {uid for uids in roles_b.values() for uid in uids}
+                self.assertFalse(users_a & users_b, f"User double-booked on issues {id_a} and {id_b}")
+
+    def test_partial_ilp_covers_at_least_greedy(self):
+        greedy = match_issues_to_users(self.issues, self.users, strategy="greedy")
+        for strategy in ("ilp-cbc", "ilp-highs"):
+            stats = {}
+            result = match_issues_to_users(self.issues, self.users, allow_partial=True, strategy=strategy,
+                                           stats=stats)
+            self.assert_schedule_valid(result)
+            self.assertEqual(stats["status"], "Optimal")
+            self.assertGreaterEqual(filled(result), filled(greedy))
+            self.assertEqual(stats["filled_seats"], filled(result))
+            self.assertLess(stats["filled_seats"], stats["required_seats"])
+            # The objective is the rating alone, like the heuristics', without the coverage reward
+            self.assertEqual(stats["objective"], EligibilityIndex(self.issues, self.users).total_rating(result))
+            self.assertEqual((stats["bound"], stats["gap"]), (stats["objective"], 0.0))
+
+    def test_full_schedule_unchanged(self):
+        """When every seat can be filled, partial mode returns the regular optimum."""
+        issues = self.issues[::8]  # 09:00, 11:00, 13:00, 15:00 - no overlaps
+        strict = match_issues_to_users(issues, self.users)
+        partial = match_issues_to_users(issues, self.users, allow_partial=True)
+        self.assertEqual(filled(partial), 8)
+        self.assertEqual(partial, strict)
+
+
+if __name__ == "__main__":
+    unittest.main()
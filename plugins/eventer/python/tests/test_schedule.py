@@ -0,0 +1,57 @@
+import os
+import random
+import sys
+import unittest
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from schedule import IntervalSchedule, Schedules
+
+
+class IntervalScheduleTests(unittest.TestCase):
+
+    def test_touching_intervals_do_not_overlap(self):
+        base = datetime(2025, 3, 7, 10, 0)
+        schedule = IntervalSchedule()
+        schedule.add(base, base + timedelta(hours=2))
+        self.assertFalse(schedule.overlaps(base + timedelta(hours=2), base + timedelta(hours=3)))
+        self.assertFalse(schedule.overlaps(base - timedelta(hours=1), base))
+        self.assertTrue(schedule.overlaps(base + timedelta(hours=1), base + timedelta(hours=1)))
+
+    def test_matches_pairwise_scan(self):
+        """Random intervals added out of order agree with a brute-force scan."""
+        rng = random.Random(7)
+        base = datetime(2025, 3, 7, 0, 0)
+        schedule = IntervalSchedule()
+        stored = []
+        for _ in range(300):
+            start = base + timedelta(minutes=rng.randrange(0, 2000))
+            end = start + timedelta(minutes=rng.randrange(0, 240))
+            if rng.random() < 0.5:
+                schedule.add(start, end)
+                stored.append((start, end))
+            expected = any(s < end and start < e for s, e in stored)
+            self.assertEqual(schedule.overlaps(start, end), expected)
+        self.assertEqual(len(schedule), len(stored))
+
+    def test_remove_restores_free_time(self):
+        base = datetime(2025, 3, 7, 10, 0)
+        schedule = IntervalSchedule()
+        schedule.add(base, base + timedelta(hours=5))
+        schedule.add(base + timedelta(hours=1), base + timedelta(hours=2))
+        schedule.remove(base, base + timedelta(hours=5))
+        self.assertFalse(schedule.overlaps(base + timedelta(hours=3), base + timedelta(hours=4)))
+        self.assertTrue(schedule.overlaps(base + timedelta(hours=1), base + timedelta(hours=4)))
+        self.assertEqual(len(schedule), 1)
+
+    def test_schedules_are_per_user(self):
+        base = datetime(2025, 3, 7, 10, 0)
+        schedules = Schedules()
+        schedules.add(1, base, base + timedelta(hours=2))
+        self.assertTrue(schedules.overlaps(1, base, base + timedelta(hours=1)))
+        self.assertFalse(schedules.overlaps(2, base, base + timedelta(hours=1)))
+
+
+if __name__ == "__main__":
+    unittest.main()
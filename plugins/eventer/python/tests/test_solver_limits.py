@@ -0,0 +1,132 @@
+import os
+import sys
+import time
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+from process import match_issues_to_users
+from sparse_model import parse_cbc_log
+from solvers import CbcBackend
+import algo_ILP
+from fixtures import at, make_issue, make_user
+
+TIME_LIMIT_LOG = """
+Cbc0045I MIPStart provided solution with cost -27
+Cbc0012I Integer solution of -27 found by Reduced search after 0 iterations and 0 nodes (0.02 seconds)
+Cbc0012I Integer solution of -31 found by DiveCoefficient after 12 iterations and 0 nodes (0.40 seconds)
+Result - Stopped on time limit
+
+Objective value:                31.00000000
+Upper bound:                    33.500
+Gap:                            -0.08
+Enumerated nodes:               120
+"""
+
+OPTIMAL_LOG = """
+Cbc0012I Integer solution of -19 found by feasibility pump after 0 iterations and 0 nodes (0.01 seconds)
+Result - Optimal solution found
+
+Objective value:                19.00000000
+Enumerated nodes:               0
+"""
+
+
+class SolverLimitTests(unittest.TestCase):
+
+    def test_parse_time_limited_log(self):
+        stats = parse_cbc_log(TIME_LIMIT_LOG)
+        self.assertTrue(stats["mipstart_accepted"])
+        self.assertEqual(stats["first_incumbent_seconds"], 0.02)
+        self.assertEqual(stats["objective"], 31.0)
+        self.assertEqual(stats["bound"], 33.5)
+        self.assertAlmostEqual(stats["gap"], 0.08)
+
+    def test_parse_optimal_log(self):
+        stats = parse_cbc_log(OPTIMAL_LOG)
+        self.assertFalse(stats["mipstart_accepted"])
+        self.assertFalse(stats["presolved"])
+        self.assertTrue(parse_cbc_log("Cbc3007W No integer variables - nothing to do")["presolved"])
+        self.assertEqual(stats["objective"], 19.0)
+        self.assertEqual(stats["bound"], 19.0)
+        self.assertEqual(stats["gap"], 0.0)
+
+    def test_limits_are_passed_through(self):
+        issues = [Issue({
+            "id": 1, "subject": "Issue 1", "category": "General",
+            "category_priority": None, "priority": "High",
+            "start_datetime": "2025-03-07T12:00:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        })]
+        users = [User({
+            "id": uid, "firstname": "Test", "lastname": "User",
+            "qualifications": [{"role": "Director", "category": "General", "rating": uid}]
+        }) for uid in (1, 2)]
+
+        stats = {}
+        results = match_issues_to_users(issues, users, time_limit=10, gap_rel=0.05, stats=stats)
+        self.assertEqual(results, {1: {"Director": [2]}})
+        self.assertEqual(stats["status"], "Optimal")
+        self.assertIsNotNone(stats["gap"])
+        self.assertLessEqual(stats["gap"], 0.05)
+
+    def test_tie_break_is_not_reported(self):
+        """Two equally rated directors: the tie-break picks one, the stats show the plain rating."""
+        issues = [Issue({
+            "id": i, "subject": f"Issue {i}", "category": "General",
+            "category_priority": None, "priority": "High",
+            "start_datetime": f"2025-03-0{i}T12:00:00",
+            "required_roles": [{"role": "Director", "required_count": 1, "assigned_users": []}]
+        }) for i in (1, 2)]
+        users = [User({
+            "id": uid, "firstname": "Test", "lastname": "User",
+            "qualifications": [{"role": "Director", "category": "General", "rating": 4}]
+        }) for uid in (1, 2)]
+
+        for strategy in ("ilp-cbc", "ilp-highs"):
+            stats = {}
+            match_issues_to_users(issues, users, strategy=strategy, stats=stats)
+            self.assertTrue(stats["proven_optimal"], strategy)
+            self.assertEqual(stats["objective"], 8.0, strategy)
+            self.assertEqual(stats["bound"], 8.0, strategy)
+            self.assertEqual(stats["gap"], 0.0, strategy)
+
+
+class SlowBackend(CbcBackend):
+    """CBC behind a fixed delay, standing in for components that are hard to solve."""
+
+    def __init__(self):
+        self.time_limits = []
+
+    def solve(self, model, time_limit=None, gap_rel=None, initial=None):
+        self.time_limits.append(time_limit)
+        time.sleep(0.2)
+        return super().solve(model, time_limit=time_limit, gap_rel=gap_rel, initial=initial)
+
+
+class DeadlineTests(unittest.TestCase):
+
+    def test_components_after_the_deadline_get_the_greedy_assignment(self):
+        # Eight independent days, each its own component
+        issues = [make_issue(day, at(10, day=day)) for day in range(1, 9)]
+        users = [make_user(1, {"Director": 5}), make_user(2, {"Director": 7})]
+        backend = SlowBackend()
+
+        stats = {}
+        started = time.perf_counter()
+        with mock.patch.object(algo_ILP, "get_backend", lambda solver: backend):
+            result = algo_ILP.ilp(issues, users, max_workers=1, time_limit=0.5, stats=stats)
+        elapsed = time.perf_counter() - started
+
+        self.assertLess(elapsed, 0.5 + 0.4, "At most the component running at the deadline overruns it")
+        self.assertLess(len(backend.time_limits), len(issues))
+        self.assertTrue(all(0 < limit <= 0.5 for limit in backend.time_limits))
+        self.assertEqual(result, {day: {"Director": [2]} for day in range(1, 9)})
+        self.assertFalse(stats["proven_optimal"])
+        self.assertEqual(stats["filled_seats"], 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
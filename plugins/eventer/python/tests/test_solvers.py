@@ -0,0 +1,93 @@
+import json
+import os
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from models import User, Issue
+from process import match_issues_to_users
+from solvers import get_backend, HighsBackend
+import only_ilp_test
+import test_algo
+import test_fallback_4
+import test_test2
+import test_test3
+import test_test_3
+
+DATA_PATH = os.path.join(os.path.dirname(__file__), "benchmark_data_200.json")
+
+
+def match_with_highs(issues, users, allow_partial=False, strategy="ilp", **kwargs):
+    """Solve ILP strategies with HiGHS, checking that CBC returns the identical assignment dict."""
+    if strategy not in ("ilp", "ilp-cbc"):
+        return match_issues_to_users(issues, users, allow_partial, strategy=strategy, **kwargs)
+    cbc = match_issues_to_users(issues, users, allow_partial, strategy="ilp-cbc", **kwargs)
+    highs = match_issues_to_users(issues, users, allow_partial, strategy="ilp-highs", **kwargs)
+    if highs != cbc:
+        raise AssertionError(f"HiGHS assignment {highs} differs from CBC assignment {cbc}")
+    return highs
+
+
+def on_highs(module, case):
+    """`case` from `module` with its ILP calls solved by both backends (see match_with_highs)."""
+
+    class HighsCase(case):
+        def setUp(self):
+            patcher = mock.patch.object(module, "match_issues_to_users", match_with_highs)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+            super().setUp()
+
+    HighsCase.__name__ = HighsCase.__qualname__ = f"Highs{case.__name__}"
+    HighsCase.__doc__ = f"The scenarios of {module.__name__}.{case.__name__}, solved with HiGHS as well as CBC."
+    return HighsCase
+
+
+HighsIssueUserMatchingTests = on_highs(test_algo, test_algo.IssueUserMatchingTests)
+HighsTestTest2 = on_highs(test_test2, test_test2.TestBacktrackingFasterThanILP)
+HighsTestTest3 = on_highs(test_test3, test_test3.TestBacktrackingFasterThanILP)
+HighsMassiveIssueAssignment = on_highs(test_test_3, test_test_3.TestMassiveIssueAssignment)
+HighsFallbackBehavior = on_highs(test_fallback_4, test_fallback_4.TestFallbackBehavior)
+
+
+class HighsCrossCategorySwapTests(only_ilp_test.TestCrossCategorySwap):
+    """
+    The ILP part of only_ilp_test on both backends. The inherited test is
+    not re-run: it also covers a heuristic strategy this tree does not have.
+    """
+
+    test_only_ilp_finds_solution = None
+
+    def test_both_backends_find_the_swap(self):
+        expected = {1: {"Technician": [2]}, 2: {"Technician": [1]}}
+        self.assertEqual(match_with_highs(self.issues, self.users, strategy="ilp"), expected)
+
+
+class SolverBackendTests(unittest.TestCase):
+
+    def test_backends_reach_same_objective(self):
+        with open(DATA_PATH, encoding="utf-8") as f:
+            data = json.load(f)
+
+        objectives = {}
+        for strategy in ("ilp-cbc", "ilp-highs"):
+            issues = [Issue(i) for i in data["issues"]]
+            users = [User(u) for u in data["users"]]
+            stats = {}
+            match_issues_to_users(issues, users, strategy=strategy, stats=stats)
+            self.assertEqual(stats["status"], "Optimal")
+            self.assertTrue(stats["proven_optimal"])
+            objectives[strategy] = stats["objective"]
+
+        self.assertAlmostEqual(objectives["ilp-cbc"], objectives["ilp-highs"])
+
+    def test_get_backend(self):
+        self.assertIsInstance(get_backend("highs"), HighsBackend)
+        with self.assertRaises(ValueError):
+            get_backend("gurobi")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,52 @@
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from process import match_issues_to_users
+from fixtures import at, make_issue, rated_users, staggered_issues
+
+
+def build_issues():
+    return staggered_issues(8, 45, 90, {"Director": 1, "Technician": 1})
+
+
+def build_users():
+    return rated_users(6, {"Director": lambda uid: 3 + uid % 5, "Technician": lambda uid: 8 - uid % 5})
+
+
+class WarmStartTests(unittest.TestCase):
+
+    def total_rating(self, result, users):
+        by_id = {u.id: u for u in users}
+        return sum(by_id[uid].get_role_rating(role, "General")
+                   for roles in result.values() for role, uids in roles.items() for uid in uids)
+
+    def test_warm_start_keeps_optimum(self):
+        issues, users = build_issues(), build_users()
+        cold = match_issues_to_users(issues, users)
+        stats = {}
+        warm = match_issues_to_users(issues, users, warm_start=True, stats=stats)
+
+        self.assertEqual(self.total_rating(warm, users), self.total_rating(cold, users))
+        self.assertTrue(stats["warm_start"])
+        self.assertEqual(stats["status"], "Optimal")
+        self.assertIn("first_incumbent_seconds", stats)
+
+    def test_mipstart_ignores_components_without_a_start(self):
+        """An issue needing nobody is its own component; CBC presolves it away before reading a start."""
+        issues, users = build_issues(), build_users()
+        issues.append(make_issue(99, at(9, day=20), required_count=0))
+        stats = {}
+        match_issues_to_users(issues, users, warm_start=True, stats=stats)
+        self.assertEqual(stats["components"], 2)
+        self.assertTrue(stats["mipstart_accepted"])
+
+        stats = {}
+        match_issues_to_users(issues, users, strategy="ilp-highs", warm_start=True, stats=stats)
+        self.assertFalse(stats["mipstart_accepted"], "scipy's HiGHS takes no start")
+
+
+if __name__ == "__main__":
+    unittest.main()